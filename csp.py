@@ -1,6 +1,12 @@
 import collections
-import networkx as nx
-import matplotlib.pyplot as plt
+import concurrent.futures
+import heapq
+import itertools
+import math
+import multiprocessing
+import time
+from localsearch import min_conflicts
+from plotting import cached_layout, draw_graph, is_headless, load_plotting
 
 # --- 1. Helper Functions for CSP ---
 
@@ -18,53 +24,953 @@ def is_consistent(variable, color, graph, assignment):
             return False
     return True
 
-# --- 2. The Backtracking Algorithm ---
+# --- 2. Generic CSP Engine ---
 
-def backtracking_csp(graph, colors):
+class Constraint:
+    """
+    Base class for n-ary constraints. scope lists variable names; once the
+    constraint is added to a CSP, vars holds the matching variable indices.
+    Subclasses implement consistent() and may override propagate() to prune.
+    """
+    def __init__(self, scope):
+        self.scope = tuple(scope)
+        self.vars = ()
+
+    def consistent(self, values):
+        """Checks a complete tuple of values, in scope order."""
+        raise NotImplementedError
+
+    def propagate(self, csp):
+        """
+        Prunes domains through csp.prune; returns False on a wipe-out or
+        violation. By default the constraint is only checked once all of its
+        variables are down to a single value.
+        """
+        values = []
+        for v in self.vars:
+            if not csp.is_fixed(v):
+                return True
+            values.append(csp.fixed_value(v))
+        return self.consistent(values)
+
+
+class Predicate(Constraint):
+    """An arbitrary test, e.g. Predicate(("A", "B"), lambda a, b: a < b)."""
+    def __init__(self, scope, test):
+        super().__init__(scope)
+        self.test = test
+
+    def consistent(self, values):
+        return self.test(*values)
+
+    def propagate(self, csp):
+        # Generalized forward checking: once a single variable is left open,
+        # keep only its values that pass the test.
+        open_vars = [v for v in self.vars if not csp.is_fixed(v)]
+        if len(open_vars) > 1:
+            return True
+        if not open_vars:
+            return self.consistent([csp.fixed_value(v) for v in self.vars])
+        target = open_vars[0]
+        keep = 0
+        for k, value in csp.domain(target):
+            trial = [value if v == target else csp.fixed_value(v) for v in self.vars]
+            if self.test(*trial):
+                keep |= 1 << k
+        return csp.prune(target, keep)
+
+
+class Sum(Constraint):
+    """
+    Linear constraint: sum(weight * value) over scope compared with total.
+    comparison is "==", "<=" or ">="; weights default to 1. Values must be numbers.
+    """
+    def __init__(self, scope, total, comparison="==", weights=None):
+        super().__init__(scope)
+        if comparison not in ("==", "<=", ">="):
+            raise ValueError(f"Unknown comparison: {comparison!r}")
+        self.total = total
+        self.comparison = comparison
+        self.weights = tuple(weights) if weights is not None else (1,) * len(self.scope)
+        if len(self.weights) != len(self.scope):
+            raise ValueError("weights and scope must have the same length")
+
+    def consistent(self, values):
+        s = sum(w * value for w, value in zip(self.weights, values))
+        if self.comparison == "==":
+            return s == self.total
+        if self.comparison == "<=":
+            return s <= self.total
+        return s >= self.total
+
+    def propagate(self, csp):
+        # Bounds reasoning: every other term at its extreme limits this one.
+        terms = []
+        for v, w in zip(self.vars, self.weights):
+            products = [w * value for _, value in csp.domain(v)]
+            terms.append((min(products), max(products)))
+        low = sum(t[0] for t in terms)
+        high = sum(t[1] for t in terms)
+        for v, w, (lo, hi) in zip(self.vars, self.weights, terms):
+            upper = self.total - (low - lo) if self.comparison in ("==", "<=") else None
+            lower = self.total - (high - hi) if self.comparison in ("==", ">=") else None
+            keep = 0
+            for k, value in csp.domain(v):
+                term = w * value
+                if (upper is None or term <= upper) and (lower is None or term >= lower):
+                    keep |= 1 << k
+            if not csp.prune(v, keep):
+                return False
+        return True
+
+
+class AllDifferent(Constraint):
+    """All variables in scope take pairwise different values, with generalized arc consistency."""
+    def consistent(self, values):
+        return len(set(values)) == len(values)
+
+    def propagate(self, csp):
+        """
+        Régin's filtering: find a maximum matching of variables to values, then
+        remove every variable-value pair that belongs to no maximum matching.
+        """
+        domains = {v: dict((value, k) for k, value in csp.domain(v)) for v in self.vars}
+        match_var, match_value = {}, {}
+
+        def augment(v, visited):
+            for value in domains[v]:
+                if value in visited:
+                    continue
+                visited.add(value)
+                if value not in match_value or augment(match_value[value], visited):
+                    match_var[v] = value
+                    match_value[value] = v
+                    return True
+            return False
+
+        for v in self.vars:
+            if not augment(v, set()):
+                return False
+
+        # Orient matched edges variable -> value and the others value -> variable.
+        # A pair survives if it is matched, lies on a cycle (same SCC), or is
+        # reachable on an alternating path from an unmatched value.
+        graph = collections.defaultdict(list)
+        for v, values in domains.items():
+            graph[("x", v)].append(("d", match_var[v]))
+            for value in values:
+                if value != match_var[v]:
+                    graph[("d", value)].append(("x", v))
+
+        all_values = {value for values in domains.values() for value in values}
+        reachable = set()
+        stack = [("d", value) for value in all_values if value not in match_value]
+        while stack:
+            node = stack.pop()
+            if node in reachable:
+                continue
+            reachable.add(node)
+            stack.extend(graph[node])
+
+        component = _strongly_connected(graph)
+        for v, values in domains.items():
+            keep = 0
+            for value, k in values.items():
+                node = ("d", value)
+                if value == match_var[v] or node in reachable \
+                        or component.get(node) == component.get(("x", v)):
+                    keep |= 1 << k
+            if not csp.prune(v, keep):
+                return False
+        return True
+
+
+def _strongly_connected(graph):
+    """Iterative Tarjan SCC; returns node -> component id."""
+    index, low, component = {}, {}, {}
+    stack, on_stack = [], set()
+    counter = 0
+    for root in list(graph):
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            for nxt in successors:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(graph.get(nxt, ()))))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component[member] = node
+                        if member == node:
+                            break
+    return component
+
+
+class CSP:
+    """
+    A constraint satisfaction problem with per-variable domains.
+    - Variables and values are indices internally; each domain is an int bitmask
+      over that variable's value list, so a removal is an AND-NOT and a domain
+      size is a popcount.
+    - Binary "must differ" constraints (the map coloring case) are kept in a
+      neighbor list and handled inline. Other constraints are objects indexed by
+      the variables they touch, so a domain change wakes only those constraints.
+    - Every domain change pushes (var, old_mask) onto a trail; backtracking just
+      pops the trail back to a mark.
+    """
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.values = []        # Per variable: its list of domain values.
+        self.value_bit = []     # Per variable: value -> bit position.
+        self.domains = []
+        self.assigned = []      # Assigned value index, -1 if unassigned.
+        self.neighbors = []     # Per variable: variables that must take a different value.
+        self.watchers = []      # Per variable: constraints whose scope includes it.
+        self.constraints = []
+        self.trail = []
+        self.unassigned = 0
+        self._queue = []
+        self._value_lists = {}  # Identical value lists are shared, see _propagate.
+
+    # --- Model building ---
+
+    def add_variable(self, name, domain):
+        if name in self.index:
+            raise ValueError(f"Variable {name!r} already exists")
+        key = tuple(domain)
+        values = self._value_lists.setdefault(key, list(key))
+        self.index[name] = len(self.names)
+        self.names.append(name)
+        self.values.append(values)
+        self.value_bit.append({value: k for k, value in enumerate(values)})
+        self.domains.append((1 << len(values)) - 1)
+        self.assigned.append(-1)
+        self.neighbors.append(set())
+        self.watchers.append([])
+        self.unassigned += 1
+
+    def add_different(self, a, b):
+        """Binary constraint: a and b must take different values."""
+        i, j = self.index[a], self.index[b]
+        if i != j:
+            self.neighbors[i].add(j)
+            self.neighbors[j].add(i)
+
+    def add_constraint(self, constraint):
+        constraint.vars = tuple(self.index[name] for name in constraint.scope)
+        for v in set(constraint.vars):
+            self.watchers[v].append(constraint)
+        self.constraints.append(constraint)
+        return constraint
+
+    # --- Domain access for constraints ---
+
+    def domain(self, v):
+        """(value index, value) pairs still in v's domain."""
+        values, mask, pairs = self.values[v], self.domains[v], []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            k = bit.bit_length() - 1
+            pairs.append((k, values[k]))
+        return pairs
+
+    def is_fixed(self, v):
+        mask = self.domains[v]
+        return mask & (mask - 1) == 0
+
+    def fixed_value(self, v):
+        return self.values[v][self.domains[v].bit_length() - 1]
+
+    def prune(self, v, keep):
+        """Restricts v's domain to the bits in keep. Returns False if it becomes empty."""
+        old = self.domains[v]
+        new = old & keep
+        if new != old:
+            self.trail.append((v, old))
+            self.domains[v] = new
+            self._queue.append(v)
+        return new != 0
+
+    # --- Search ---
+
+    def select_variable(self):
+        """MRV by popcount, ties broken by the most unassigned neighbors and constraints."""
+        assigned, domains, neighbors = self.assigned, self.domains, self.neighbors
+        best, best_size, best_degree = None, None, -1
+        for v in range(len(domains)):
+            if assigned[v] >= 0:
+                continue
+            size = domains[v].bit_count()
+            if best_size is not None and size > best_size:
+                continue
+            degree = sum(1 for n in neighbors[v] if assigned[n] < 0) + len(self.watchers[v])
+            if best_size is None or size < best_size or degree > best_degree:
+                best, best_size, best_degree = v, size, degree
+                if size <= 1:
+                    break   # A forced variable; nothing can beat it.
+        return best
+
+    def order_values(self, v):
+        """
+        Least-constraining-value order of v's value indices: values that remove
+        the fewest options from unassigned "must differ" neighbors come first.
+        """
+        assigned, domains, values = self.assigned, self.domains, self.values
+        order = [k for k, _ in self.domain(v)]
+        free = [n for n in self.neighbors[v] if assigned[n] < 0 and values[n] is values[v]]
+        if free:
+            order.sort(key=lambda k: sum(1 for n in free if domains[n] >> k & 1))
+        return order
+
+    def assign(self, v, k, inference="mac"):
+        """
+        Gives v its k-th value and propagates.
+        inference: None (check only fully assigned constraints),
+        "forward_checking" (prune with the constraints on v, once), or "mac"
+        (keep propagating every change to a fixpoint).
+        Returns False on a conflict; the caller undoes the change with unassign.
+        """
+        self.assigned[v] = k
+        self.unassigned -= 1
+        if inference is None:
+            return self._check_assigned(v)
+        # v is always queued, even if its domain was already down to this value.
+        bit = 1 << k
+        if self.domains[v] != bit:
+            self.trail.append((v, self.domains[v]))
+            self.domains[v] = bit
+        self._queue = [v]
+        return self._propagate(cascade=(inference == "mac"))
+
+    def _check_assigned(self, v):
+        assigned, values = self.assigned, self.values
+        value = values[v][assigned[v]]
+        for n in self.neighbors[v]:
+            if assigned[n] >= 0 and values[n][assigned[n]] == value:
+                return False
+        for c in self.watchers[v]:
+            if all(assigned[u] >= 0 for u in c.vars):
+                if not c.consistent([values[u][assigned[u]] for u in c.vars]):
+                    return False
+        return True
+
+    def _propagate(self, cascade):
+        """
+        Processes the queue of variables whose domain changed. A variable down to
+        one value removes it from its "must differ" neighbors (an AND-NOT when they
+        share a value list), and each changed variable wakes its constraints.
+        Without cascade (forward checking) only the first variable is followed up.
+        """
+        domains, values, value_bit = self.domains, self.values, self.value_bit
+        queue = self._queue
+        pending, scheduled = [], set()
+        head = 0
+        while True:
+            while head < len(queue):
+                u = queue[head]
+                head += 1
+                mask = domains[u]
+                if mask & (mask - 1) == 0:
+                    for n in self.neighbors[u]:
+                        if values[n] is values[u]:
+                            bit = mask
+                        else:
+                            k = value_bit[n].get(values[u][mask.bit_length() - 1])
+                            if k is None:
+                                continue
+                            bit = 1 << k
+                        if domains[n] & bit and not self.prune(n, ~bit):
+                            return False
+                for c in self.watchers[u]:
+                    if c not in scheduled:
+                        scheduled.add(c)
+                        pending.append(c)
+                if not cascade:
+                    break
+            if not cascade:
+                head = len(queue)
+            if not pending:
+                return True
+            c = pending.pop()
+            scheduled.discard(c)
+            if not c.propagate(self):
+                return False
+
+    def unassign(self, v, mark):
+        """Unassigns v and restores every domain changed since the trail had length mark."""
+        self._undo_to(mark)
+        self.assigned[v] = -1
+        self.unassigned += 1
+
+    def _undo_to(self, mark):
+        """Restores every domain changed since the trail had length mark."""
+        trail, domains = self.trail, self.domains
+        while len(trail) > mark:
+            u, old = trail.pop()
+            domains[u] = old
+
+    def _enumerate(self, inference, symmetric_values, counters=None, stop=None):
+        """
+        Iterative depth-first search over all complete assignments (no recursion
+        limit on large problems). At each one it pauses and yields how many
+        distinct value indices are in use (max index + 1).
+        With symmetric_values (all variables share one value list whose values are
+        interchangeable, as colors are) value index k may only be chosen once
+        indices 0..k-1 are in use, so each solution is produced once per
+        value-permutation class instead of once per permutation.
+        stop() is polled every 1024 nodes; if it returns True the walk ends and
+        self.stopped is set. The engine is back at the root state when the walk ends.
+        """
+        if symmetric_values and any(values is not self.values[0] for values in self.values):
+            raise ValueError("symmetric_values needs every variable to share one value list")
+        if counters is None:
+            counters = {"nodes": 0, "backtracks": 0}
+        self.stopped = False
+        if any(mask == 0 for mask in self.domains):
+            return
+        root_mark = len(self.trail)
+        if inference is not None:
+            # Make the root consistent before the first decision.
+            self._queue = list(range(len(self.names)))
+            if not self._propagate(cascade=True):
+                self._undo_to(root_mark)
+                return
+        stack = []
+        used = 0
+        while True:
+            var = self.select_variable()
+            if var is None:
+                yield used
+            else:
+                stack.append([var, self.order_values(var), 0, len(self.trail), used])
+            while True:
+                if not stack:
+                    self._undo_to(root_mark)
+                    return
+                frame = stack[-1]
+                var, values, pos, mark, used_before = frame
+                if self.assigned[var] >= 0:
+                    # Back at this variable: undo its previous value before the next try.
+                    self.unassign(var, mark)
+                    counters["backtracks"] += 1
+                if pos == len(values):
+                    stack.pop()
+                    continue
+                frame[2] += 1
+                k = values[pos]
+                if symmetric_values and k > used_before:
+                    continue    # A second "new" value would only repeat a permutation.
+                counters["nodes"] += 1
+                if stop is not None and counters["nodes"] % 1024 == 0 and stop():
+                    while stack:
+                        var, _, _, mark, _ = stack.pop()
+                        if self.assigned[var] >= 0:
+                            self.unassign(var, mark)
+                    self._undo_to(root_mark)
+                    self.stopped = True
+                    return
+                if self.assign(var, k, inference):
+                    used = max(used_before, k + 1)
+                    break
+
+    def search(self, inference="mac", counters=None, stop=None, symmetric_values=False):
+        """
+        Backtracking search for one complete assignment, left in place.
+        Returns True if every variable was assigned, False if there is no solution,
+        or None if the optional stop() callable said to quit.
+        """
+        for _ in self._enumerate(inference, symmetric_values, counters, stop):
+            return True
+        return None if self.stopped else False
+
+    def assignment(self):
+        """The current assignment as a name -> value dictionary."""
+        return {self.names[i]: self.values[i][k] for i, k in enumerate(self.assigned) if k >= 0}
+
+    def solve(self, inference="mac", stats=None, symmetric_values=False):
+        """
+        Searches for a complete assignment. Returns a name -> value dictionary,
+        or None if there is none. stats receives 'nodes' and 'backtracks'.
+        """
+        counters = {"nodes": 0, "backtracks": 0}
+        found = self.search(inference, counters, symmetric_values=symmetric_values)
+        if stats is not None:
+            stats.update(counters)
+        return self.assignment() if found else None
+
+    # --- Enumeration ---
+
+    def solutions(self, inference="mac", symmetric_values=False):
+        """
+        Generator over all solutions, as name -> value dictionaries, produced
+        lazily. See _enumerate for symmetric_values.
+        """
+        for _ in self._enumerate(inference, symmetric_values):
+            yield self.assignment()
+
+    def count_solutions(self, inference="mac", symmetric_values=False, by_values_used=False):
+        """
+        Counts solutions without building any assignment dictionaries.
+        With symmetric_values the count is of value-permutation classes.
+        With by_values_used a {distinct values used: count} dictionary is returned.
+        """
+        counts = collections.Counter(self._enumerate(inference, symmetric_values))
+        return dict(counts) if by_values_used else sum(counts.values())
+
+
+def coloring_csp(graph, colors):
+    """Builds the map coloring CSP: every node takes a color, neighbors differ."""
+    problem = CSP()
+    for node in graph:
+        problem.add_variable(node, colors)
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            if neighbor not in problem.index:
+                problem.add_variable(neighbor, colors)
+            problem.add_different(node, neighbor)
+    return problem
+
+# --- 3. Graph Decomposition ---
+
+def _undirected_adjacency(graph):
+    """Symmetric neighbor sets without self-loops, including neighbor-only nodes."""
+    adjacency = {node: set() for node in graph}
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            if neighbor != node:
+                adjacency[node].add(neighbor)
+                adjacency.setdefault(neighbor, set()).add(node)
+    return adjacency
+
+def connected_components(graph):
+    """Splits the graph into its connected components, each as its own adjacency dict."""
+    adjacency = _undirected_adjacency(graph)
+    seen = set()
+    components = []
+    for start in adjacency:
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = collections.deque([start])
+        members = []
+        while queue:
+            node = queue.popleft()
+            members.append(node)
+            for neighbor in adjacency[node]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        components.append({node: sorted(adjacency[node]) for node in members})
+    return components
+
+def biconnected_blocks(graph):
+    """
+    Tarjan's algorithm (iterative) for biconnected blocks.
+    Returns (blocks, articulation_points); each block is a set of nodes, and
+    blocks only share nodes at articulation points.
+    """
+    adjacency = _undirected_adjacency(graph)
+    disc, low = {}, {}
+    blocks, articulation_points = [], set()
+    time_counter = 0
+    for root in adjacency:
+        if root in disc:
+            continue
+        disc[root] = low[root] = time_counter
+        time_counter += 1
+        if not adjacency[root]:
+            blocks.append({root})
+            continue
+        root_children = 0
+        edge_stack = []
+        stack = [(root, None, iter(adjacency[root]))]
+        while stack:
+            node, parent, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if neighbor == parent:
+                    continue
+                if neighbor not in disc:
+                    disc[neighbor] = low[neighbor] = time_counter
+                    time_counter += 1
+                    edge_stack.append((node, neighbor))
+                    stack.append((neighbor, node, iter(adjacency[neighbor])))
+                    break
+                if disc[neighbor] < disc[node]:
+                    # Back edge to an ancestor.
+                    low[node] = min(low[node], disc[neighbor])
+                    edge_stack.append((node, neighbor))
+            else:
+                # All neighbors done: report to the parent.
+                stack.pop()
+                if parent is None:
+                    continue
+                low[parent] = min(low[parent], low[node])
+                if low[node] >= disc[parent]:
+                    # parent separates node's subtree: pop that block's edges.
+                    block = set()
+                    while True:
+                        edge = edge_stack.pop()
+                        block.update(edge)
+                        if edge == (parent, node):
+                            break
+                    blocks.append(block)
+                    if parent == root:
+                        root_children += 1
+                    else:
+                        articulation_points.add(parent)
+        if root_children > 1:
+            articulation_points.add(root)
+    return blocks, articulation_points
+
+def _solve_subgraph(args):
+    """Process-pool worker: colors one subgraph with the CSP engine."""
+    subgraph, colors, inference = args
+    counters = {}
+    # Colors are interchangeable, so each permutation class is tried only once.
+    solution = coloring_csp(subgraph, colors).solve(inference, counters, symmetric_values=True)
+    return solution, counters
+
+def _merge_blocks(blocks, block_solutions):
+    """
+    Joins independently colored blocks at their articulation points.
+    Blocks are visited along the block-cut tree; a block reached through an
+    articulation point has two colors swapped throughout so that it agrees with
+    the color already given to that point. Swapping two colors everywhere in a
+    block keeps it properly colored, since every node can take every color.
+    """
+    node_blocks = collections.defaultdict(list)
+    for i, block in enumerate(blocks):
+        for node in block:
+            node_blocks[node].append(i)
+    assignment = {}
+    done = [False] * len(blocks)
+    for root in range(len(blocks)):
+        if done[root]:
+            continue
+        done[root] = True
+        assignment.update(block_solutions[root])
+        queue = collections.deque([root])
+        while queue:
+            for node in blocks[queue.popleft()]:
+                for i in node_blocks[node]:
+                    if done[i]:
+                        continue
+                    done[i] = True
+                    solution = block_solutions[i]
+                    want, have = assignment[node], solution[node]
+                    swap = {want: have, have: want}
+                    for member, color in solution.items():
+                        assignment[member] = swap.get(color, color)
+                    queue.append(i)
+    return assignment
+
+# --- 4. The Backtracking Algorithm ---
+
+def backtracking_csp(graph, colors, inference="mac", stats=None,
+                     decompose="components", processes=1):
     """
     The main backtracking function to solve the map coloring CSP.
+    A thin front-end over coloring_csp and the CSP engine: variables are chosen
+    by MRV with a degree tie-break and colors by LCV.
+    inference: None (backward checks only), "forward_checking" or "mac"
+    (forward checking followed by AC-3 propagation).
+    decompose: None (one search over the whole graph), "components" (each
+    connected component searched on its own) or "blocks" (each biconnected
+    block searched on its own, then joined at articulation points). A failure
+    in one part then never causes backtracking in an unrelated part.
+    processes: with more than 1, the parts are solved across a process pool.
+    If a stats dict is given, 'nodes' (colors tried), 'backtracks' and
+    'subproblems' (parts solved) are recorded in it.
     Returns the color assignment dictionary if a solution is found, otherwise None.
     """
-    # Keep track of the nodes and the current color assignments
-    nodes = list(graph.keys())
-    assignment = {}
+    if decompose is None:
+        parts = [graph]
+    elif decompose == "components":
+        parts = connected_components(graph)
+    elif decompose == "blocks":
+        blocks, _ = biconnected_blocks(graph)
+        adjacency = _undirected_adjacency(graph)
+        parts = [{node: [n for n in adjacency[node] if n in block] for node in block}
+                 for block in blocks]
+    else:
+        raise ValueError(f"Unknown decompose mode: {decompose!r}")
+
+    tasks = [(part, colors, inference) for part in parts]
+    results = []
+    # Solving stops at the first part that cannot be colored.
+    if processes is not None and processes > 1 and len(tasks) > 1:
+        # Many tiny islands are batched so each worker gets a decent amount of work.
+        chunksize = max(1, len(tasks) // (processes * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+            for result in pool.map(_solve_subgraph, tasks, chunksize=chunksize):
+                results.append(result)
+                if result[0] is None:
+                    pool.shutdown(cancel_futures=True)
+                    break
+    else:
+        for task in tasks:
+            results.append(_solve_subgraph(task))
+            if results[-1][0] is None:
+                break
+
+    counters = {"nodes": 0, "backtracks": 0, "subproblems": len(results)}
+    for _, part_counters in results:
+        counters["nodes"] += part_counters["nodes"]
+        counters["backtracks"] += part_counters["backtracks"]
+    if stats is not None:
+        stats.update(counters)
 
-    def backtrack():
-        # If all nodes are assigned a color, we have a solution
-        if len(assignment) == len(nodes):
-            return assignment
-
-        # Select the next node to color
-        var = select_unassigned_variable(nodes, assignment)
-        
-        # Try each color in the domain
-        for color in colors:
-            # Check if the color is consistent with the neighbors
-            if is_consistent(var, color, graph, assignment):
-                # Assign the color
-                assignment[var] = color
-                
-                # Recursively call backtrack
-                result = backtrack()
-                if result:
-                    return result
-                
-                # If the recursive call failed, backtrack (un-assign the color)
-                del assignment[var]
-        
-        # If no color works, return failure
+    solutions = [solution for solution, _ in results]
+    if any(solution is None for solution in solutions):
         return None
+    if decompose == "blocks":
+        return _merge_blocks(blocks, solutions)
+    assignment = {}
+    for solution in solutions:
+        assignment.update(solution)
+    return assignment
+
+# --- 5. Enumerating and Counting Colorings ---
+
+def enumerate_colorings(graph, colors, inference="mac", symmetry_breaking=True):
+    """
+    Lazily yields colorings as name -> color dictionaries.
+    With symmetry_breaking each coloring is yielded once up to renaming the
+    colors: a new color is only used after all lower-numbered colors are.
+    """
+    problem = coloring_csp(graph, colors)
+    yield from problem.solutions(inference, symmetric_values=symmetry_breaking)
+
+def _merge_class_counts(left, right, k):
+    """
+    Combines per-component counts of color-permutation classes, keyed by the
+    number of colors used. Joining an a-color class with a b-color class can pair
+    j of their colors (C(a, j) * C(b, j) * j! ways), giving a + b - j colors.
+    """
+    merged = collections.Counter()
+    for a, count_a in left.items():
+        for b, count_b in right.items():
+            for j in range(min(a, b) + 1):
+                if a + b - j <= k:
+                    ways = math.comb(a, j) * math.comb(b, j) * math.factorial(j)
+                    merged[a + b - j] += count_a * count_b * ways
+    return dict(merged)
+
+def count_colorings(graph, colors, up_to_symmetry=False, inference="mac"):
+    """
+    Counts proper colorings without materializing them.
+    Each connected component is searched on its own, with color symmetry
+    broken, and the per-component class counts are combined exactly.
+    Returns the number of colorings, or the number of classes up to renaming
+    the colors if up_to_symmetry is set.
+    """
+    k = len(colors)
+    classes = {0: 1}
+    for component in connected_components(graph):
+        counts = coloring_csp(component, colors).count_solutions(
+            inference, symmetric_values=True, by_values_used=True)
+        if not counts:
+            return 0
+        classes = _merge_class_counts(classes, counts, k)
+    if up_to_symmetry:
+        return sum(classes.values())
+    return sum(count * math.perm(k, used) for used, count in classes.items())
+
+# --- 6. Minimum Number of Colors ---
+
+def dsatur_coloring(graph):
+    """
+    DSATUR greedy coloring: repeatedly colors the node with the most distinct
+    neighbor colors (ties: most uncolored neighbors) with the lowest free color.
+    Returns a node -> color index dictionary; max index + 1 is an upper bound
+    on the number of colors needed.
+    """
+    adjacency = _undirected_adjacency(graph)
+    neighbor_colors = {node: set() for node in adjacency}
+    uncolored_degree = {node: len(adjacency[node]) for node in adjacency}
+    coloring = {}
+    heap = [(0, -uncolored_degree[node], i, node) for i, node in enumerate(adjacency)]
+    heapq.heapify(heap)
+    order = {node: i for i, node in enumerate(adjacency)}
+    while heap:
+        saturation, degree, _, node = heapq.heappop(heap)
+        if node in coloring or -saturation != len(neighbor_colors[node]) \
+                or -degree != uncolored_degree[node]:
+            continue    # Stale heap entry.
+        color = 0
+        while color in neighbor_colors[node]:
+            color += 1
+        coloring[node] = color
+        for neighbor in adjacency[node]:
+            if neighbor in coloring:
+                continue
+            uncolored_degree[neighbor] -= 1
+            neighbor_colors[neighbor].add(color)
+            heapq.heappush(heap, (-len(neighbor_colors[neighbor]), -uncolored_degree[neighbor],
+                                  order[neighbor], neighbor))
+    return coloring
+
+def greedy_clique(graph, tries=32):
+    """
+    Finds a large clique greedily, starting from each of the highest-degree nodes.
+    Its size is a lower bound on the number of colors needed.
+    """
+    adjacency = _undirected_adjacency(graph)
+    starts = sorted(adjacency, key=lambda n: len(adjacency[n]), reverse=True)[:tries]
+    best = []
+    for start in starts:
+        clique = [start]
+        candidates = set(adjacency[start])
+        while candidates:
+            node = max(candidates, key=lambda n: len(adjacency[n] & candidates))
+            clique.append(node)
+            candidates &= adjacency[node]
+        if len(clique) > len(best):
+            best = clique
+    return best
 
-    return backtrack()
+# Bounds shared by the portfolio workers; set per process by _init_portfolio.
+_portfolio_bounds = None
 
-# --- 3. NetworkX Visualization ---
+def _init_portfolio(lower, upper, finished):
+    global _portfolio_bounds
+    _portfolio_bounds = (lower, upper, finished)
 
-def display_colored_graph(graph, color_assignment):
-    """Creates and displays the colored graph using NetworkX."""
+def _bound_settled(k):
+    """True once it is known whether k colors suffice, or the run is over."""
+    lower, upper, finished = _portfolio_bounds
+    return finished.value or k >= upper.value or k < lower.value
+
+def _exact_worker(graph, k):
+    """Decides k-colorability component by component with the CSP engine."""
+    if _bound_settled(k):
+        return k, "stopped", None
+    palette = list(range(k))
+    coloring = {}
+    for component in sorted(connected_components(graph), key=len, reverse=True):
+        problem = coloring_csp(component, palette)
+        found = problem.search("mac", stop=lambda: _bound_settled(k), symmetric_values=True)
+        if found is None:
+            return k, "stopped", None
+        if not found:
+            return k, "unsat", None
+        coloring.update(problem.assignment())
+    return k, "sat", coloring
+
+def _local_search_worker(graph, k, seed):
+    """
+    Min-conflicts tabu search (localsearch.min_conflicts) for a k-coloring.
+    Runs until it finds a coloring or the shared bounds make k pointless.
+    """
+    if _bound_settled(k):
+        return k, "stopped", None
+    stats = {}
+    coloring = min_conflicts(_undirected_adjacency(graph), list(range(k)), time_limit=math.inf,
+                             seed=seed, stats=stats, stop=lambda: _bound_settled(k))
+    if stats["conflicts"]:
+        return k, "stopped", None
+    return k, "sat", coloring
+
+def minimum_coloring(graph, processes=None, time_limit=None, stats=None):
+    """
+    Finds the minimum number of colors for the map.
+    DSATUR gives a quick upper bound and a greedy clique a lower bound. While they
+    differ, a process-pool portfolio runs exact backtracking for each open color
+    count k and min-conflicts local search for one color fewer than the best
+    coloring so far. Every proven bound is written to shared memory, so workers
+    whose k is already settled stop early, and the run ends when the bounds meet.
+    Returns (coloring, lower, upper): a node -> color index dictionary using
+    upper colors, and the proven lower bound (equal to upper unless time_limit
+    ran out). stats, if given, receives 'dsatur', 'clique' and 'seconds'.
+    """
+    start_time = time.perf_counter()
+    best = dsatur_coloring(graph)
+    upper_bound = max(best.values()) + 1 if best else 0
+    lower_bound = len(greedy_clique(graph)) if best else 0
+    if stats is not None:
+        stats.update({"dsatur": upper_bound, "clique": lower_bound})
+
+    lower = multiprocessing.Value("i", lower_bound)
+    upper = multiprocessing.Value("i", upper_bound)
+    finished = multiprocessing.Value("b", 0)
+    if lower_bound < upper_bound:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_portfolio,
+                initargs=(lower, upper, finished)) as pool:
+            seeds = itertools.count(1)
+            local_k = upper_bound - 1
+            running = {pool.submit(_local_search_worker, graph, local_k, next(seeds))}
+            # Exact runs near both bounds first: those settle the answer soonest.
+            ks = list(range(lower_bound, upper_bound))
+            ks.sort(key=lambda k: min(k - lower_bound, upper_bound - 1 - k))
+            running.update(pool.submit(_exact_worker, graph, k) for k in ks)
+
+            while running and lower.value < upper.value:
+                remaining = None
+                if time_limit is not None:
+                    remaining = time_limit - (time.perf_counter() - start_time)
+                    if remaining <= 0:
+                        break
+                done, running = concurrent.futures.wait(
+                    running, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    k, status, coloring = future.result()
+                    with upper.get_lock():
+                        if status == "sat" and k < upper.value:
+                            upper.value = k
+                            best = coloring
+                    with lower.get_lock():
+                        if status == "unsat" and k + 1 > lower.value:
+                            lower.value = k + 1
+                # Keep a local search running one color below the best coloring.
+                if upper.value - 1 >= lower.value and upper.value - 1 < local_k:
+                    local_k = upper.value - 1
+                    running.add(pool.submit(_local_search_worker, graph, local_k, next(seeds)))
+            # Whatever is still running (e.g. after the deadline) is told to stop.
+            finished.value = 1
+            for future in running:
+                future.cancel()
+
+    if stats is not None:
+        stats["seconds"] = time.perf_counter() - start_time
+    return best, lower.value, upper.value
+
+# --- 7. NetworkX Visualization ---
+
+def display_colored_graph(graph, color_assignment, output=None):
+    """
+    Creates and displays the colored graph using NetworkX. With an output
+    path (.png, .svg, ...) the drawing is written to that file instead.
+    """
     if not color_assignment:
         print("No solution to display.")
         return
+    if output is None and is_headless():
+        print("Headless mode: skipping graph display.")
+        return
 
+    nx, _ = load_plotting()
     G = nx.Graph()
     # Add all edges from our adjacency list representation
     for node, neighbors in graph.items():
@@ -75,19 +981,15 @@ def display_colored_graph(graph, color_assignment):
     node_colors = [color_assignment.get(node, 'gray') for node in G.nodes()]
 
     print("\nDisplaying the colored graph...")
-    plt.figure(figsize=(8, 6))
-    
-    # Use a layout that spreads nodes out well
-    pos = nx.spring_layout(G, seed=42)
-    
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, 
-            node_size=2000, font_size=12, font_color='white',
-            width=2.0, edge_color='gray')
-            
-    plt.title("Map Coloring Solution")
-    plt.show()
+    # Use a layout that spreads nodes out well (cached across runs)
+    pos = cached_layout(G)
 
-# --- 4. Main Program Execution ---
+    draw_graph(G, pos, "Map Coloring Solution", output=output,
+               with_labels=True, node_color=node_colors,
+               node_size=2000, font_size=12, font_color='white',
+               width=2.0, edge_color='gray')
+
+# --- 8. Main Program Execution ---
 if __name__ == "__main__":
     graph = collections.defaultdict(list)
 
@@ -120,12 +1022,27 @@ if __name__ == "__main__":
     colors_to_use = ['Red', 'Green', 'Blue']
     print(f"\nAttempting to color the map with {len(colors_to_use)} colors: {', '.join(colors_to_use)}")
     
-    solution = backtracking_csp(graph, colors_to_use)
+    stats = {}
+    solution = backtracking_csp(graph, colors_to_use, stats=stats)
+    print(f"Nodes visited: {stats['nodes']}, Backtracks: {stats['backtracks']}")
+
+    if not solution:
+        print("\n❌ No solution found with the given colors.")
+        print("Searching for the minimum number of colors instead...")
+        min_stats = {}
+        coloring, lower, upper = minimum_coloring(graph, time_limit=60, stats=min_stats)
+        print(f"DSATUR bound: {min_stats['dsatur']}, clique bound: {min_stats['clique']}")
+        if lower == upper:
+            print(f"The map needs exactly {upper} colors.")
+        else:
+            print(f"The map needs between {lower} and {upper} colors (time limit reached).")
+        palette = ['Red', 'Green', 'Blue', 'Yellow', 'Purple', 'Orange', 'Cyan', 'Magenta',
+                   'Brown', 'Pink', 'Olive', 'Navy']
+        palette += [f"C{i}" for i in range(len(palette), upper)]
+        solution = {node: palette[color] for node, color in coloring.items()}
 
     if solution:
         print("\n✅ Solution found!")
         for node, color in sorted(solution.items()):
             print(f"  - {node}: {color}")
-        display_colored_graph(graph, solution)
-    else:
-        print("\n❌ No solution found with the given colors.")
\ No newline at end of file
+        display_colored_graph(graph, solution, output="map_coloring.png" if is_headless() else None)
\ No newline at end of file
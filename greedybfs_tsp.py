@@ -1,10 +1,52 @@
 import collections
+import numpy as np
+from tsp import (HELD_KARP_MAX_CITIES, DistanceMatrix, EuclideanInstance, held_karp,
+                 optimality_gap)
+
+def _greedy_complete(dist, heuristics, start_node):
+    """
+    Greedy BFS over a complete DistanceMatrix or EuclideanInstance. Every
+    unvisited city is a neighbor of the current one, so the tour is simply
+    the other cities sorted by heuristic value (ties in index order), and no
+    distance is computed except along the tour.
+    """
+    if start_node not in dist.index:
+        print(f"Error: Starting city '{start_node}' not found in the graph.")
+        return None, 0
+    names = dist.names
+    start = dist.index[start_node]
+    inf = float('inf')
+    # As in the scan, a city without a finite heuristic value is never chosen.
+    values = [heuristics.get(name, inf) for name in names]
+    order = sorted((i for i in range(len(names)) if i != start and values[i] < inf),
+                   key=values.__getitem__)
+    tour = [start] + order
+    if len(tour) < len(names):
+        print(f"Error: Stuck at '{names[tour[-1]]}'. Cannot reach any unvisited city.")
+        return None, 0
+    return_cost = dist.distance(tour[-1], start)
+    if return_cost == inf:
+        print(f"Error: No return path from '{names[tour[-1]]}' back to '{start_node}'.")
+        return None, 0
+    total_cost = sum(map(dist.distance, tour, tour[1:])) + return_cost
+    tour.append(start)
+    return [names[i] for i in tour], dist.cost_value(total_cost)
 
 def solve_tsp_greedy_heuristic(graph, heuristics, start_node):
     """
     Finds a TSP tour using a Greedy Best-First Search style heuristic.
     At each step, it travels to the unvisited neighbor with the lowest heuristic value.
+    The graph may also be a DistanceMatrix or EuclideanInstance, e.g. from
+    tsp.load_tsplib; complete ones skip the neighbor scan entirely.
     """
+    if isinstance(graph, EuclideanInstance):
+        return _greedy_complete(graph, heuristics, start_node)
+    if isinstance(graph, DistanceMatrix):
+        off_diagonal = ~np.eye(len(graph), dtype=bool)
+        if np.isfinite(graph.matrix[off_diagonal]).all():
+            return _greedy_complete(graph, heuristics, start_node)
+        graph = graph.to_graph()
+
     # --- 1. Initialization ---
     # Create a set of all unique cities in the graph.
     all_cities = set(graph.keys())
@@ -22,22 +64,60 @@ def solve_tsp_greedy_heuristic(graph, heuristics, start_node):
     total_cost = 0  # This will be the SUM of actual edge costs.
     current_city = start_node
 
+    # --- Heuristic-ordered index ---
+    # The heuristic does not depend on the current city, so the cities are
+    # sorted by it once; visited cities are skipped lazily from the front.
+    # Cities with equal values form a run with a count of unvisited members,
+    # so a unique minimum is recognized in O(1). If that city is a neighbor
+    # of the current one it is exactly what the scan would pick; otherwise
+    # (sparse graphs, ties) the step falls back to scanning the neighbors.
+    inf = float('inf')
+    # The sort is stable, so tied cities stay in the graph's key order.
+    cities = list(graph) + [city for city in all_cities if city not in graph]
+    order = sorted((city for city in cities if heuristics.get(city, inf) < inf),
+                   key=heuristics.__getitem__)
+    run_of, run_left = {}, []
+    for k, city in enumerate(order):
+        if k == 0 or heuristics[city] != heuristics[order[k - 1]]:
+            run_left.append(0)
+        run_left[-1] += 1
+        run_of[city] = len(run_left) - 1
+    if start_node in run_of:
+        run_left[run_of[start_node]] -= 1
+    # Ties go to the neighbor listed first. If the graph is complete and every
+    # row lists the cities in the graph's key order, that is also the order
+    # within each run, so the front of the index is the scan's pick every step.
+    ordered_rows = False
+    if len(run_left) < len(order) and len(graph) == len(all_cities):
+        keys = list(graph)
+        ordered_rows = all(list(graph[city]) in (keys[:k] + keys[k + 1:], keys)
+                           for k, city in enumerate(keys))
+    slot = 0
+
     # --- 2. Build the Tour ---
     # Loop until all cities have been visited.
     while len(tour) < len(all_cities):
         best_next_city = None
         min_heuristic = float('inf')  # Start with an infinitely high heuristic value.
+        neighbors = graph.get(current_city, {})
+
+        while slot < len(order) and order[slot] in visited:
+            slot += 1
+        candidate = order[slot] if slot < len(order) else None
+        if candidate is not None and (ordered_rows or run_left[run_of[candidate]] == 1
+                                      and candidate in neighbors):
+            best_next_city = candidate
+        else:
+            # --- CORE LOGIC CHANGE ---
+            # Find the unvisited neighbor with the lowest heuristic value.
+            for neighbor in neighbors.keys():
+                if neighbor not in visited:
+                    # Compare heuristic values instead of edge costs.
+                    neighbor_heuristic = heuristics.get(neighbor, float('inf'))
+                    if neighbor_heuristic < min_heuristic:
+                        min_heuristic = neighbor_heuristic
+                        best_next_city = neighbor
 
-        # --- CORE LOGIC CHANGE ---
-        # Find the unvisited neighbor with the lowest heuristic value.
-        for neighbor in graph.get(current_city, {}).keys():
-            if neighbor not in visited:
-                # Compare heuristic values instead of edge costs.
-                neighbor_heuristic = heuristics.get(neighbor, float('inf'))
-                if neighbor_heuristic < min_heuristic:
-                    min_heuristic = neighbor_heuristic
-                    best_next_city = neighbor
-        
         # If a valid next city was chosen based on the heuristic...
         if best_next_city:
             # ...find the ACTUAL travel cost from the graph.
@@ -46,6 +126,7 @@ def solve_tsp_greedy_heuristic(graph, heuristics, start_node):
             # Update the tour and state.
             tour.append(best_next_city)
             visited.add(best_next_city)
+            run_left[run_of[best_next_city]] -= 1
             total_cost += travel_cost  # Add the real travel cost to the total.
             current_city = best_next_city
         else:
@@ -112,5 +193,12 @@ if __name__ == "__main__":
         print("\n✅ Greedy TSP Tour Found (using heuristic for decisions):")
         print(f"   Path: {' -> '.join(tour)}")
         print(f"   Total Actual Cost: {cost}")
+
+        # On small maps, compare against the exact optimum.
+        if len(tour) - 1 <= HELD_KARP_MAX_CITIES:
+            stats = {}
+            _, optimal_cost = held_karp(graph, start_node, stats=stats)
+            print(f"\n📏 Optimal Cost (Held-Karp, {stats['nodes']} subproblems): {optimal_cost}")
+            print(f"   Heuristic tour gap: {optimality_gap(cost, optimal_cost):.1%}")
     else:
         print("\n❌ Could not find a complete tour.")
\ No newline at end of file
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+# --- Import-time benchmark ---
+# Each solver module is imported in a fresh interpreter so earlier imports can't
+# warm the cache. The check fails if importing a solver pulls in networkx or
+# matplotlib, which should only load when a display function is called.
+
+MODULES = ["csp", "localsearch", "minimax", "pruning"]
+HEAVY = ["networkx", "matplotlib"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(f"{{elapsed}}|{{','.join(loaded)}}")
+"""
+
+def time_import(module, repeats=5):
+    """Returns (best import time in seconds, heavy modules that got loaded)."""
+    best, loaded = None, []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True)
+        elapsed, names = result.stdout.strip().split("|")
+        elapsed = float(elapsed)
+        if best is None or elapsed < best:
+            best = elapsed
+        loaded = [name for name in names.split(",") if name]
+    return best, loaded
+
+def main():
+    print("--- Solver Import Times ---")
+    failed = False
+    for module in MODULES:
+        elapsed, loaded = time_import(module)
+        status = "ok" if not loaded else f"FAIL (loaded {', '.join(loaded)})"
+        print(f"{module:<12} {elapsed * 1000:8.1f} ms   {status}")
+        failed = failed or bool(loaded)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
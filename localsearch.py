@@ -1,7 +1,9 @@
 import collections
+import os
 import random
-import networkx as nx
-import matplotlib.pyplot as plt
+import time
+from array import array
+from plotting import cached_layout, draw_graph, is_headless, load_plotting
 
 # --- 1. Hill Climbing Core Functions ---
 
@@ -27,6 +29,104 @@ def calculate_conflicts(graph, assignment):
                 
     return conflicts
 
+class ConflictState:
+    """
+    Incremental local-search state for graph coloring. For every node it keeps
+    how many neighbors currently have each color, so the change in total
+    conflicts for recoloring one node is a table lookup and applying the move
+    only touches that node's neighbors. The assignment is never copied.
+    """
+
+    def __init__(self, graph, colors, assignment):
+        self.colors = list(colors)
+        self.nodes = list(graph)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                if neighbor not in self.index:
+                    self.index[neighbor] = len(self.nodes)
+                    self.nodes.append(neighbor)
+        color_index = {color: c for c, color in enumerate(self.colors)}
+
+        # Adjacency over node indices. Repeated edges count once, as in
+        # calculate_conflicts; self-loops are a fixed conflict no move can fix.
+        adjacency = [set() for _ in self.nodes]
+        self.self_loops = 0
+        for node, neighbors in graph.items():
+            u = self.index[node]
+            for neighbor in neighbors:
+                v = self.index[neighbor]
+                if u == v:
+                    adjacency[u].add(u)
+                else:
+                    adjacency[u].add(v)
+                    adjacency[v].add(u)
+        self.neighbors = []
+        for u, adjacent in enumerate(adjacency):
+            if u in adjacent:
+                adjacent.discard(u)
+                self.self_loops += 1
+            self.neighbors.append(list(adjacent))
+
+        self.color = [color_index[assignment[node]] for node in self.nodes]
+        self.counts = [[0] * len(self.colors) for _ in self.nodes]
+        for u, adjacent in enumerate(self.neighbors):
+            row = self.counts[u]
+            for v in adjacent:
+                row[self.color[v]] += 1
+        self.conflicts = self.self_loops + sum(
+            self.counts[u][self.color[u]] for u in range(len(self.nodes))) // 2
+
+        # Nodes with at least one same-colored neighbor, kept as a list plus
+        # each node's slot in it so membership changes and random picks are O(1).
+        self.conflicted = []
+        self._slot = [-1] * len(self.nodes)
+        for u in range(len(self.nodes)):
+            self._update_conflicted(u)
+
+    def _update_conflicted(self, u):
+        slot = self._slot[u]
+        if self.counts[u][self.color[u]]:
+            if slot < 0:
+                self._slot[u] = len(self.conflicted)
+                self.conflicted.append(u)
+        elif slot >= 0:
+            last = self.conflicted.pop()
+            if last != u:
+                self.conflicted[slot] = last
+                self._slot[last] = slot
+            self._slot[u] = -1
+
+    def node_conflicts(self, u):
+        """Number of neighbors of node index u sharing its color."""
+        return self.counts[u][self.color[u]]
+
+    def delta(self, u, c):
+        """Change in total conflicts if node index u were recolored to color index c."""
+        row = self.counts[u]
+        return row[c] - row[self.color[u]]
+
+    def move(self, u, c):
+        """Recolors node index u to color index c, updating the counts of its neighbors."""
+        old = self.color[u]
+        if old == c:
+            return
+        self.conflicts += self.counts[u][c] - self.counts[u][old]
+        self.color[u] = c
+        counts = self.counts
+        color = self.color
+        for v in self.neighbors[u]:
+            row = counts[v]
+            row[old] -= 1
+            row[c] += 1
+            if color[v] == old or color[v] == c:
+                self._update_conflicted(v)
+        self._update_conflicted(u)
+
+    def assignment(self):
+        """Returns the current coloring as a {node: color} dict."""
+        return {node: self.colors[c] for node, c in zip(self.nodes, self.color)}
+
 def hill_climbing(graph, colors, max_iterations=1000):
     """
     Attempts to solve the map coloring CSP using hill climbing.
@@ -35,65 +135,483 @@ def hill_climbing(graph, colors, max_iterations=1000):
     current_assignment = {}
     for node in graph:
         current_assignment[node] = random.choice(colors)
-        
+    state = ConflictState(graph, colors, current_assignment)
+    # Candidate moves in the same order as scanning graph nodes, then colors
+    graph_nodes = [state.index[node] for node in graph]
+    num_colors = len(state.colors)
+
     for i in range(max_iterations):
-        current_cost = calculate_conflicts(graph, current_assignment)
-        
+        current_cost = state.conflicts
+
         # Goal Check: If cost is 0, we found a perfect solution.
         if current_cost == 0:
             print(f"Success! Found a solution in {i} iterations.")
-            return current_assignment
-        
-        # 3. Find Best Neighbor
-        best_neighbor_assignment = None
-        best_neighbor_cost = current_cost
-        
-        # Check every possible single-node change
-        for node in graph:
-            original_color = current_assignment[node]
-            for new_color in colors:
-                if new_color == original_color:
-                    continue
-                    
-                # Create the "neighbor" assignment
-                neighbor_assignment = current_assignment.copy()
-                neighbor_assignment[node] = new_color
-                
-                # Calculate the cost of this new state
-                neighbor_cost = calculate_conflicts(graph, neighbor_assignment)
-                
-                # If this is the best move we've found so far, save it
-                if neighbor_cost < best_neighbor_cost:
-                    best_neighbor_cost = neighbor_cost
-                    best_neighbor_assignment = neighbor_assignment
-        
+            return state.assignment()
+
+        # 3. Find Best Neighbor: the single-node change with the lowest cost,
+        # scored from the conflict counts instead of a copied assignment
+        best_move = None
+        best_delta = 0
+        for u in graph_nodes:
+            row = state.counts[u]
+            current = row[state.color[u]]
+            for c in range(num_colors):
+                if row[c] - current < best_delta:
+                    best_delta = row[c] - current
+                    best_move = (u, c)
+
         # 4. Move or Get Stuck
-        if best_neighbor_assignment is None:
+        if best_move is None:
             # No move improved the score. We are at a local minimum.
             print(f"Stuck at a local minimum after {i} iterations.")
             print(f"Final state has {current_cost} conflicts.")
-            return current_assignment
-        
-        # 5. Move: Adopt the best neighbor's assignment as our new current state
-        current_assignment = best_neighbor_assignment
-        
+            return state.assignment()
+
+        # 5. Move: apply the best change in place
+        state.move(*best_move)
+
     print(f"Reached max iterations ({max_iterations}).")
-    print(f"Final state has {calculate_conflicts(graph, current_assignment)} conflicts.")
-    return current_assignment
+    print(f"Final state has {state.conflicts} conflicts.")
+    return state.assignment()
+
+# --- 2. Min-Conflicts Tabu Search ---
+
+# The clock (and the stop callback) are read whenever about this much work has
+# been done since the last check, counted in scored moves and recolored
+# neighbors, so checks stay frequent even when single steps are expensive.
+_CHECK_WORK = 1 << 14
+
+def _apply_diff(color, diff):
+    """A copy of the color list with the node colors in diff put back."""
+    color = list(color)
+    for u, c in diff.items():
+        color[u] = c
+    return color
+
+def min_conflicts(graph, colors, time_limit=10.0, tabu_tenure=None, walk_probability=0.02,
+                  restart_after=None, sample_size=64, seed=None, stats=None, trace=None, stop=None):
+    """
+    Min-conflicts local search with a tabu list, bounded by time_limit seconds.
+    Each step recolors one conflicted node to the color that lowers the
+    conflict count the most; when more than sample_size nodes are conflicted,
+    only a random sample of that many is scored, so a step costs
+    O(sample_size * colors) however large the graph. Undoing a recent move is
+    tabu for a while unless it would beat the best score seen (aspiration);
+    with walk_probability a random conflicted node gets a random color
+    instead. If restart_after steps pass without a new best, the search
+    restarts from a random assignment.
+
+    The clock is read after a fixed amount of work rather than a fixed number
+    of steps. Building the initial O(V + E) state counts against time_limit
+    but can't be cut short.
+
+    Returns the best assignment seen (zero conflicts if one was found). If a
+    trace list is passed, (seconds, conflicts) points are appended whenever
+    the best score improves and at every clock check. stop, if given, is
+    polled along with the clock and ends the search when it returns True.
+    """
+    rng = random.Random(seed)
+    start_time = time.perf_counter()
+    deadline = start_time + time_limit
+
+    def random_state():
+        return ConflictState(graph, colors, {node: rng.choice(colors) for node in graph})
+
+    state = random_state()
+    num_colors = len(state.colors)
+    if restart_after is None:
+        restart_after = 50 * len(state.nodes) + 1000
+
+    best_conflicts = state.conflicts
+    best_colors = list(state.color)
+    # Copying the coloring after every new best would cost O(n) per step, so
+    # the best is tracked as the current coloring plus best_diff, the old
+    # colors of the nodes moved since then. best_diff is None after a
+    # restart, when best_colors holds the best instead.
+    best_diff = {}
+    run_best = state.conflicts
+    stale = 0
+    restarts = 0
+    iteration = 0
+    work = 0
+    # tabu[u][c] is the first iteration at which node u may take color c again
+    tabu = [[0] * num_colors for _ in state.nodes]
+    if trace is not None:
+        trace.append((0.0, best_conflicts))
+
+    while state.conflicted:
+        iteration += 1
+        if work >= _CHECK_WORK:
+            work = 0
+            now = time.perf_counter()
+            if now >= deadline or (stop is not None and stop()):
+                break
+            if trace is not None:
+                trace.append((now - start_time, state.conflicts))
+
+        if stale >= restart_after:
+            if best_diff is not None:
+                best_colors = _apply_diff(state.color, best_diff)
+                best_diff = None
+            state = random_state()
+            tabu = [[0] * num_colors for _ in state.nodes]
+            run_best = state.conflicts
+            stale = 0
+            restarts += 1
+            work += len(state.nodes)
+            if not state.conflicted:
+                best_conflicts, best_colors = 0, list(state.color)
+                break
+            continue
+
+        conflicted = state.conflicted
+        move = None
+        if rng.random() >= walk_probability:
+            # Best non-tabu move among (a sample of) the conflicted nodes, ties
+            # broken at random
+            best_delta = None
+            ties = 0
+            counts, color = state.counts, state.color
+            aspiration = best_conflicts - state.conflicts
+            scanned = conflicted if len(conflicted) <= sample_size else rng.choices(conflicted, k=sample_size)
+            work += len(scanned) * num_colors
+            for u in scanned:
+                row = counts[u]
+                current = row[color[u]]
+                tabu_row = tabu[u]
+                for c in range(num_colors):
+                    if c == color[u]:
+                        continue
+                    delta = row[c] - current
+                    if tabu_row[c] > iteration and delta >= aspiration:
+                        continue
+                    if best_delta is None or delta < best_delta:
+                        best_delta, move, ties = delta, (u, c), 1
+                    elif delta == best_delta:
+                        ties += 1
+                        if rng.random() * ties < 1.0:
+                            move = (u, c)
+        if move is None and num_colors > 1:
+            # Random walk (or every move is tabu): any other color for a conflicted node
+            u = conflicted[rng.randrange(len(conflicted))]
+            c = rng.randrange(num_colors - 1)
+            move = (u, c if c < state.color[u] else c + 1)
+        if move is None:
+            break
+
+        u, c = move
+        old = state.color[u]
+        if best_diff is not None:
+            if u not in best_diff:
+                best_diff[u] = old
+            elif best_diff[u] == c:
+                del best_diff[u]
+        state.move(u, c)
+        work += len(state.neighbors[u]) + 1
+        tenure = tabu_tenure if tabu_tenure is not None else int(0.6 * len(state.conflicted))
+        tabu[u][old] = iteration + tenure + rng.randrange(10) + 1
+
+        if state.conflicts < run_best:
+            run_best = state.conflicts
+            stale = 0
+        else:
+            stale += 1
+        if state.conflicts < best_conflicts:
+            best_conflicts = state.conflicts
+            best_diff = {}
+            if trace is not None:
+                trace.append((time.perf_counter() - start_time, best_conflicts))
+
+    if best_diff is not None:
+        best_colors = _apply_diff(state.color, best_diff)
+    if stats is not None:
+        stats["iterations"] = iteration
+        stats["restarts"] = restarts
+        stats["conflicts"] = best_conflicts
+        stats["seconds"] = time.perf_counter() - start_time
+    return {node: state.colors[c] for node, c in zip(state.nodes, best_colors)}
+
+# --- 3. Vectorized Simulated Annealing ---
+# For very large graphs the graph is a pair of NumPy edge arrays (src[i], dst[i])
+# over node indices 0..n-1 and the coloring is an int8 array. NumPy is imported
+# inside these functions so the rest of the module doesn't depend on it.
+
+def edge_arrays(graph):
+    """
+    Converts an adjacency-list graph to (nodes, src, dst): the node list and
+    two int32 arrays holding each undirected edge once, as node indices.
+    """
+    import numpy as np
+    index = {node: i for i, node in enumerate(graph)}
+    nodes = list(graph)
+    edges = set()
+    for node, neighbors in graph.items():
+        u = index[node]
+        for neighbor in neighbors:
+            if neighbor not in index:
+                index[neighbor] = len(nodes)
+                nodes.append(neighbor)
+            v = index[neighbor]
+            edges.add((u, v) if u <= v else (v, u))
+    pairs = np.array(sorted(edges), dtype=np.int32).reshape(-1, 2)
+    return nodes, pairs[:, 0].copy(), pairs[:, 1].copy()
+
+def count_conflicts_array(src, dst, colors):
+    """Number of edges whose endpoints share a color, in one vectorized comparison."""
+    return int((colors[src] == colors[dst]).sum())
+
+def _cooling(schedule, t_start, t_end):
+    """Maps the elapsed fraction of the time budget to a temperature."""
+    if callable(schedule):
+        return schedule
+    if schedule == "geometric":
+        return lambda frac: t_start * (t_end / t_start) ** frac
+    if schedule == "linear":
+        return lambda frac: t_start + (t_end - t_start) * frac
+    raise ValueError(f"Unknown cooling schedule: {schedule!r}")
+
+def anneal_coloring(src, dst, num_nodes, num_colors, time_limit=10.0, batch_size=1024,
+                    t_start=1.0, t_end=0.2, schedule="geometric", refresh=64,
+                    initial=None, seed=None, stats=None):
+    """
+    Simulated annealing over an edge-array graph. Each step draws batch_size
+    random recolorings (at most an eighth of the nodes), mostly among
+    conflicted nodes, and scores them all at once by gathering the candidates'
+    neighbor colors. Moves are accepted with the Metropolis rule at the
+    current temperature; of two adjacent accepted moves in the same batch
+    only the one on the lower node index is applied, so the applied moves are
+    independent and their deltas add up exactly.
+
+    schedule is "geometric", "linear" or a function from the elapsed fraction
+    of time_limit (0..1) to a temperature. Returns the best int8 coloring seen.
+    """
+    import numpy as np
+    if not 1 <= num_colors <= 127:
+        raise ValueError("num_colors must be between 1 and 127 for an int8 coloring.")
+    temperature = _cooling(schedule, t_start, t_end)
+    rng = np.random.default_rng(seed)
+    start_time = time.perf_counter()
+
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    loops = src == dst
+    self_loops = int(loops.sum())
+    src, dst = src[~loops], dst[~loops]
+
+    # CSR adjacency: the neighbors of u are indices[indptr[u]:indptr[u + 1]]
+    heads = np.concatenate([src, dst])
+    order = np.argsort(heads, kind="stable")
+    indices = np.concatenate([dst, src])[order]
+    degree = np.bincount(heads, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+
+    if initial is None:
+        colors = rng.integers(0, num_colors, num_nodes, dtype=np.int8)
+    else:
+        colors = np.array(initial, dtype=np.int8)
 
-# --- 2. Visualization ---
+    def recount():
+        same = colors[src] == colors[dst]
+        pool = np.unique(np.concatenate([src[same], dst[same]]))
+        return int(same.sum()) + self_loops, pool
 
-def display_colored_graph(graph, assignment):
+    conflicts, pool = recount()
+    best_conflicts, best_colors = conflicts, colors.copy()
+    # Big batches on small graphs would pick nearly every node and leave
+    # hardly any independent moves.
+    batch_size = max(1, min(batch_size, num_nodes // 8))
+    everyone = np.arange(num_nodes)
+    marked = np.zeros(num_nodes, dtype=bool)
+    batches = moves = accepted = 0
+    frac = 0.0
+
+    while conflicts > self_loops and num_colors > 1:
+        frac = (time.perf_counter() - start_time) / time_limit if time_limit > 0 else 1.0
+        if frac >= 1.0:
+            break
+        t = max(temperature(frac), 1e-9)
+        batches += 1
+        if batches % refresh == 0:
+            conflicts, pool = recount()
+
+        # Candidates: mostly from the (possibly stale) conflicted pool, some uniform
+        candidates = pool if pool.size else everyone
+        picks = candidates[rng.integers(0, candidates.size, batch_size)]
+        picks[: batch_size // 8] = rng.integers(0, num_nodes, batch_size // 8)
+        nodes = np.unique(picks)
+        old = colors[nodes]
+        new = ((old.astype(np.int16) + rng.integers(1, num_colors, nodes.size)) % num_colors).astype(np.int8)
+
+        # Gather every candidate's neighbors in one flat array
+        lengths = degree[nodes]
+        owner = np.repeat(np.arange(nodes.size), lengths)
+        starts = np.repeat(indptr[nodes] - (np.cumsum(lengths) - lengths), lengths)
+        neighbors = indices[starts + np.arange(owner.size)]
+        neighbor_colors = colors[neighbors]
+        gain = (neighbor_colors == new[owner]).astype(np.int64) - (neighbor_colors == old[owner])
+        delta = np.bincount(owner, weights=gain, minlength=nodes.size).astype(np.int64)
+
+        accept = (delta <= 0) | (rng.random(nodes.size) < np.exp(-np.maximum(delta, 0) / t))
+        marked[nodes[accept]] = True
+        blocked = marked[neighbors] & (neighbors < nodes[owner])
+        clash = np.bincount(owner, weights=blocked, minlength=nodes.size) > 0
+        marked[nodes[accept]] = False
+        apply = accept & ~clash
+
+        colors[nodes[apply]] = new[apply]
+        conflicts += int(delta[apply].sum())
+        moves += nodes.size
+        accepted += int(apply.sum())
+        if conflicts < best_conflicts:
+            best_conflicts = conflicts
+            best_colors = colors.copy()
+
+    if stats is not None:
+        seconds = time.perf_counter() - start_time
+        stats["batches"] = batches
+        stats["moves"] = moves
+        stats["accepted"] = accepted
+        stats["conflicts"] = best_conflicts
+        stats["seconds"] = seconds
+        stats["moves_per_second"] = moves / seconds if seconds > 0 else 0.0
+    return best_colors
+
+def simulated_annealing(graph, colors, time_limit=10.0, seed=None, stats=None, **options):
     """
-    Displays the final colored graph using NetworkX.
+    Runs anneal_coloring on an adjacency-list graph and returns the best
+    coloring as a {node: color} dict, like hill_climbing.
+    """
+    nodes, src, dst = edge_arrays(graph)
+    best = anneal_coloring(src, dst, len(nodes), len(colors), time_limit=time_limit,
+                           seed=seed, stats=stats, **options)
+    return {node: colors[c] for node, c in zip(nodes, best.tolist())}
+
+# --- 4. Parallel Multi-Start Search ---
+
+# Graph and stop flag shared by the multi-start workers; set per process by
+# _init_multistart. The adjacency arrives through shared memory, not pickling.
+# The multiprocessing modules are imported on use to keep the module import cheap.
+_multistart_shared = None
+
+def _init_multistart(block_name, num_nodes, colors, stop_flag):
+    global _multistart_shared
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        # Layout: indptr (num_nodes + 1 entries) followed by the neighbor indices
+        csr = block.buf.cast("i")
+        indptr = csr[:num_nodes + 1]
+        graph = {u: list(csr[num_nodes + 1 + indptr[u]:num_nodes + 1 + indptr[u + 1]])
+                 for u in range(num_nodes)}
+        del indptr, csr
+    finally:
+        block.close()
+    _multistart_shared = (graph, colors, stop_flag)
+
+def _multistart_worker(seed, run_limit, deadline):
+    """One seeded min-conflicts run; stops at the deadline or when another run succeeds."""
+    graph, colors, stop_flag = _multistart_shared
+    report = {"seed": seed, "pid": os.getpid()}
+    # A run that only starts near the overall deadline gets just the time left.
+    time_limit = min(run_limit, deadline - time.time())
+    if stop_flag.value or time_limit <= 0:
+        report.update(iterations=0, restarts=0, conflicts=None, seconds=0.0, stopped=True)
+        return report, None
+    stats = {}
+    assignment = min_conflicts(graph, colors, time_limit=time_limit, seed=seed, stats=stats,
+                               stop=lambda: stop_flag.value or time.time() >= deadline)
+    report.update(stats)
+    report["stopped"] = stats["conflicts"] > 0 and stop_flag.value == 1
+    return report, [assignment[u] for u in range(len(graph))]
+
+def multistart_search(graph, colors, starts=None, processes=None, time_limit=10.0, stats=None):
+    """
+    Runs independent seeded min-conflicts searches across a process pool and
+    returns the best assignment found. The time_limit is split so that all
+    starts fit in it: each run gets time_limit * processes / starts seconds,
+    or less if the overall deadline is closer. The graph is written once to a
+    shared memory block that every worker reads at startup. As soon as one
+    run reaches zero conflicts, the others are told to stop and queued runs
+    are cancelled. stats, if given, receives 'conflicts', 'seconds' and
+    'workers': one report per run with its seed, pid, iterations, restarts,
+    conflicts, seconds and whether it was stopped early.
+    """
+    import concurrent.futures
+    import multiprocessing
+    from multiprocessing import shared_memory
+    start_time = time.perf_counter()
+    processes = processes or os.cpu_count() or 1
+    starts = starts or processes
+    deadline = time.time() + time_limit
+    run_limit = time_limit * min(processes, starts) / starts
+
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    for neighbors in list(graph.values()):
+        for neighbor in neighbors:
+            if neighbor not in index:
+                index[neighbor] = len(nodes)
+                nodes.append(neighbor)
+    adjacency = [set() for _ in nodes]
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            adjacency[index[node]].add(index[neighbor])
+            adjacency[index[neighbor]].add(index[node])
+    csr = array("i", [0])
+    for adjacent in adjacency:
+        csr.append(csr[-1] + len(adjacent))
+    for adjacent in adjacency:
+        csr.extend(sorted(adjacent))
+
+    block = shared_memory.SharedMemory(create=True, size=max(len(csr) * csr.itemsize, 1))
+    block.buf[:len(csr) * csr.itemsize] = csr.tobytes()
+    stop_flag = multiprocessing.Value("b", 0)
+    best, best_conflicts, reports = None, None, []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_multistart,
+                initargs=(block.name, len(nodes), list(range(len(colors))), stop_flag)) as pool:
+            running = [pool.submit(_multistart_worker, seed, run_limit, deadline) for seed in range(1, starts + 1)]
+            for future in concurrent.futures.as_completed(running):
+                if future.cancelled():
+                    continue
+                report, color_indices = future.result()
+                reports.append(report)
+                if color_indices is not None and (best_conflicts is None or report["conflicts"] < best_conflicts):
+                    best, best_conflicts = color_indices, report["conflicts"]
+                if best_conflicts == 0 and not stop_flag.value:
+                    stop_flag.value = 1
+                    for other in running:
+                        other.cancel()
+    finally:
+        block.close()
+        block.unlink()
+
+    if stats is not None:
+        stats["conflicts"] = best_conflicts
+        stats["seconds"] = time.perf_counter() - start_time
+        stats["workers"] = sorted(reports, key=lambda report: report["seed"])
+    return {node: colors[c] for node, c in zip(nodes, best)} if best is not None else None
+
+# --- 5. Visualization ---
+
+def display_colored_graph(graph, assignment, output=None):
+    """
+    Displays the final colored graph using NetworkX, or writes it to the
+    output file (.png, .svg, ...) when one is given.
     """
     if not assignment:
         print("No solution to display.")
         return
+    if output is None and is_headless():
+        print("Headless mode: skipping graph display.")
+        return
 
     # Map our 'r', 'g', 'b' domain to actual color names
     color_map = {'r': 'red', 'g': 'green', 'b': 'blue'}
     
+    nx, _ = load_plotting()
     G = nx.Graph()
     for node, neighbors in graph.items():
         for neighbor in neighbors:
@@ -103,17 +621,14 @@ def display_colored_graph(graph, assignment):
     node_colors = [color_map.get(assignment.get(node), 'gray') for node in G.nodes()]
 
     print("\nDisplaying the colored graph...")
-    plt.figure(figsize=(8, 6))
-    pos = nx.spring_layout(G, seed=42)
-    
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, 
-            node_size=2000, font_size=12, font_color='white',
-            width=2.0, edge_color='gray')
-            
-    plt.title("Map Coloring - Hill Climbing Solution")
-    plt.show()
+    pos = cached_layout(G)
 
-# --- 3. Main Program ---
+    draw_graph(G, pos, "Map Coloring - Hill Climbing Solution", output=output,
+               with_labels=True, node_color=node_colors,
+               node_size=2000, font_size=12, font_color='white',
+               width=2.0, edge_color='gray')
+
+# --- 6. Main Program ---
 if __name__ == "__main__":
     graph = collections.defaultdict(list)
     colors_to_use = ['r', 'g', 'b'] # Our 'rgb' domain
@@ -146,10 +661,17 @@ if __name__ == "__main__":
     
     solution = hill_climbing(graph, colors_to_use)
 
+    if solution and calculate_conflicts(graph, solution) > 0:
+        print("\nHill climbing got stuck. Running min-conflicts tabu search (10s budget)...")
+        stats = {}
+        solution = min_conflicts(graph, colors_to_use, time_limit=10.0, stats=stats)
+        print(f"Min-conflicts: {stats['conflicts']} conflicts after {stats['iterations']} steps, "
+              f"{stats['restarts']} restarts, {stats['seconds']:.2f}s.")
+
     if solution:
         print("\n✅ Final Coloring:")
         for node, color in sorted(solution.items()):
             print(f"  - {node}: {color}")
-        display_colored_graph(graph, solution)
+        display_colored_graph(graph, solution, output="map_coloring.png" if is_headless() else None)
     else:
         print("\n❌ No solution found.")
\ No newline at end of file
@@ -1,6 +1,5 @@
 import math
-import networkx as nx
-import matplotlib.pyplot as plt
+from plotting import cached_layout, draw_graph, is_headless, load_plotting
 import collections
 
 # --- 1. The Node Class: Our Tree's Building Block ---
@@ -120,8 +119,16 @@ def build_graph(node, graph):
         graph.add_edge(node.name, child.name)
         build_graph(child, graph)
 
-def display_with_networkx(root):
-    """Creates and displays the graph with all calculated values."""
+def display_with_networkx(root, output=None):
+    """
+    Creates and displays the graph with all calculated values, or writes it
+    to the output file (.png, .svg, ...) when one is given.
+    """
+    if output is None and is_headless():
+        print("Headless mode: skipping tree display.")
+        return
+
+    nx, _ = load_plotting()
     G = nx.DiGraph()
     build_graph(root, G)
 
@@ -139,20 +146,13 @@ def display_with_networkx(root):
     # Create labels in the format: "NodeName\n[CalculatedValue]"
     labels = {n.name: f"{n.name}\n[{n.minimax_value}]" for n in all_nodes}
     
-    try:
-        # Use graphviz for a proper top-down hierarchical tree layout.
-        pos = nx.drawing.nx_pydot.graphviz_layout(G, prog='dot')
-    except ImportError:
-        print("\nPyGraphviz not found. Using a simpler layout.")
-        pos = nx.spring_layout(G)
-
-    plt.figure(figsize=(10, 7))
-    nx.draw(G, pos, labels=labels, with_labels=True, arrows=False,
-            node_size=3000, node_color='skyblue', font_size=11,
-            font_weight='bold', width=2.0, edge_color='gray')
-    
-    plt.title("Minimax Tree with Calculated Values")
-    plt.show()
+    # Top-down hierarchical tree layout (graphviz 'dot' when available).
+    pos = cached_layout(G, tree=True)
+
+    draw_graph(G, pos, "Minimax Tree with Calculated Values", output=output,
+               figsize=(10, 7), labels=labels, with_labels=True, arrows=False,
+               node_size=3000, node_color='skyblue', font_size=11,
+               font_weight='bold', width=2.0, edge_color='gray')
 
 # --- 5. Main Program Execution ---
 
@@ -173,6 +173,6 @@ if __name__ == "__main__":
         print("Displaying the full tree with calculated values...")
         
         # Display the final, annotated tree.
-        display_with_networkx(root)
+        display_with_networkx(root, output="minimax_tree.png" if is_headless() else None)
     else:
         print("No tree was created.")
\ No newline at end of file
@@ -0,0 +1,171 @@
+import os
+
+# --- Shared plotting setup for the graph and tree demos ---
+# networkx and matplotlib are slow to import and pull in a GUI backend, and the
+# solvers never need them. The display functions call load_plotting() so the
+# libraries are only imported the first time something is actually drawn.
+
+# Headless mode skips every plot window. Turn it on with AI_LAB_HEADLESS=1 in the
+# environment (e.g. for batch workers) or by calling set_headless().
+_headless = os.environ.get("AI_LAB_HEADLESS", "").strip().lower() not in ("", "0", "false", "no")
+
+def set_headless(enabled=True):
+    """Turns headless mode on or off for this process."""
+    global _headless
+    _headless = enabled
+
+def is_headless():
+    return _headless
+
+def load_plotting():
+    """
+    Imports networkx and matplotlib.pyplot on first use and returns (nx, plt).
+    In headless mode the non-interactive Agg backend is selected first, so no
+    display is ever opened.
+    """
+    import matplotlib
+    if _headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import networkx as nx
+    return nx, plt
+
+# --- Cached layouts and file rendering ---
+# Layouts are the slow part of drawing a big graph, and they only depend on the
+# graph's structure, so they are stored on disk keyed by a hash of the nodes and
+# edges. Re-rendering the same graph with new colors or values reuses the layout.
+
+LAYOUT_CACHE_DIR = os.environ.get("AI_LAB_LAYOUT_CACHE", ".layout_cache")
+
+# Above this many nodes spring_layout is too slow and labels are unreadable, so
+# a fast layout is used and the drawing style is scaled down.
+LARGE_GRAPH = 1000
+
+def graph_key(G, method):
+    """Returns a hash of the graph's structure and the layout method."""
+    import hashlib
+    digest = hashlib.sha1()
+    digest.update(f"{method}|{G.is_directed()}|".encode())
+    for node in sorted(map(repr, G.nodes())):
+        digest.update(node.encode())
+        digest.update(b"\0")
+    if G.is_directed():
+        edges = sorted((repr(u), repr(v)) for u, v in G.edges())
+    else:
+        edges = sorted(tuple(sorted((repr(u), repr(v)))) for u, v in G.edges())
+    for u, v in edges:
+        digest.update(f"{u}\1{v}\0".encode())
+    return digest.hexdigest()
+
+def _tree_roots(G):
+    return [n for n in G.nodes() if G.in_degree(n) == 0] if G.is_directed() else list(G.nodes())[:1]
+
+def tree_layout(G):
+    """
+    Top-down hierarchical layout without graphviz. Leaves are spaced evenly
+    in depth-first order and each parent sits centered above its children.
+    """
+    pos = {}
+    next_x = 0
+    for root in _tree_roots(G):
+        # Iterative preorder walk so deep trees don't hit the recursion limit.
+        depth = {root: 0}
+        children = {}
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            children[node] = [c for c in G.neighbors(node) if c not in depth]
+            for child in children[node]:
+                depth[child] = depth[node] + 1
+            stack.extend(reversed(children[node]))
+        for node in order:
+            if not children[node]:
+                pos[node] = (next_x, -depth[node])
+                next_x += 1
+        for node in reversed(order):
+            if children[node]:
+                first, last = pos[children[node][0]][0], pos[children[node][-1]][0]
+                pos[node] = ((first + last) / 2, -depth[node])
+    return pos
+
+def _graphviz_layout(nx, G, prog):
+    try:
+        return nx.nx_agraph.graphviz_layout(G, prog=prog)
+    except ImportError:
+        return nx.nx_pydot.graphviz_layout(G, prog=prog)
+
+def _compute_layout(nx, G, tree):
+    if tree:
+        try:
+            return _graphviz_layout(nx, G, "dot")
+        except (ImportError, OSError):
+            return tree_layout(G)
+    if G.number_of_nodes() <= LARGE_GRAPH:
+        return nx.spring_layout(G, seed=42)
+    try:
+        # sfdp is graphviz's multilevel force-directed layout for big graphs.
+        return _graphviz_layout(nx, G, "sfdp")
+    except (ImportError, OSError):
+        try:
+            return nx.spectral_layout(G)
+        except ImportError:
+            return nx.spring_layout(G, seed=42, iterations=20)
+
+def cached_layout(G, tree=False, cache_dir=None):
+    """
+    Returns node positions for G, loading them from the layout cache when the
+    same structure was laid out before. Trees use a hierarchical layout.
+    """
+    import json
+    nx, _ = load_plotting()
+    cache_dir = LAYOUT_CACHE_DIR if cache_dir is None else cache_dir
+    path = os.path.join(cache_dir, graph_key(G, "tree" if tree else "graph") + ".json")
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+        by_repr = {repr(n): n for n in G.nodes()}
+        return {by_repr[key]: tuple(xy) for key, xy in stored.items()}
+
+    pos = _compute_layout(nx, G, tree)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({repr(n): [float(x), float(y)] for n, (x, y) in pos.items()}, f)
+    os.replace(tmp_path, path)
+    return pos
+
+def draw_graph(G, pos, title, output=None, figsize=(8, 6), **draw_options):
+    """
+    Draws G at the given positions. With an output path the figure is written
+    to that file (the extension picks PNG, SVG, ...) without touching a GUI
+    backend; otherwise it is shown in a window. Large graphs are drawn with
+    small unlabeled nodes and thin edges.
+    """
+    nx, _ = load_plotting()
+    if G.number_of_nodes() > LARGE_GRAPH:
+        draw_options.update(with_labels=False, node_size=10, width=0.3, arrows=False)
+        figsize = (16, 12)
+
+    if output is not None:
+        # A bare Figure with an Agg canvas never registers with pyplot.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        nx.draw(G, pos, ax=ax, **draw_options)
+        ax.set_title(title)
+        fig.savefig(output, dpi=150, bbox_inches="tight")
+        print(f"Saved drawing to {output}")
+        return
+
+    if is_headless():
+        print("Headless mode: skipping display (pass an output file to render).")
+        return
+    _, plt = load_plotting()
+    plt.figure(figsize=figsize)
+    nx.draw(G, pos, **draw_options)
+    plt.title(title)
+    plt.show()
@@ -1,29 +1,60 @@
+import ast
+import collections
+import heapq
+import re
+import time
+from array import array
+from itertools import compress, count
+from operator import not_, sub
+
+
+def _normalize(text):
+    """Lower-cases a proposition and collapses its whitespace."""
+    return " ".join(text.lower().split())
+
+
+def _parse_implication(implication):
+    """
+    Splits "If P, Q" into normalized (antecedent, consequent).
+    Returns None if the text is not in that format.
+    """
+    if "if" not in implication.lower() or "," not in implication:
+        return None
+    antecedent, consequent = _normalize(implication).split(",", 1)
+    if antecedent.startswith("if "):
+        antecedent = antecedent[3:]
+    return antecedent.strip(), consequent.strip()
+
+
+def _strip_negation(text):
+    """Returns P for "Not P", or None if the text is not a negation."""
+    text = _normalize(text)
+    if text.startswith("not "):
+        return text[4:]
+    return None
+
+
 def modus_ponens(implication, premise):
     # Parse implication like: "If it rains, the ground is wet"
-    if "if" not in implication.lower() or "," not in implication:
+    parsed = _parse_implication(implication)
+    if parsed is None:
         return "Invalid implication format. Use: 'If P, Q'"
+    antecedent, consequent = parsed
 
-    parts = implication.lower().split(",")
-    antecedent = parts[0].replace("if", "").strip()
-    consequent = parts[1].strip()
-
-    if premise.lower() == antecedent:
+    if _normalize(premise) == antecedent:
         return f"Therefore, {consequent} (Modus Ponens)"
     else:
         return "Premise does not match antecedent. Cannot apply Modus Ponens."
 
 
 def modus_tollens(implication, negated_consequent):
-    if "if" not in implication.lower() or "," not in implication:
+    parsed = _parse_implication(implication)
+    if parsed is None:
         return "Invalid implication format. Use: 'If P, Q'"
+    antecedent, consequent = parsed
 
-    parts = implication.lower().split(",")
-    antecedent = parts[0].replace("if", "").strip()
-    consequent = parts[1].strip()
-
-    if negated_consequent.lower().startswith("not "):
-        given_consequent = negated_consequent.lower().replace("not ", "").strip()
-    else:
+    given_consequent = _strip_negation(negated_consequent)
+    if given_consequent is None:
         return "Must provide negation of consequent (e.g., 'Not Q')"
 
     if given_consequent == consequent:
@@ -32,6 +63,77 @@ def modus_tollens(implication, negated_consequent):
         return "Consequent does not match. Cannot apply Modus Tollens."
 
 
+class ImplicationKB:
+    """
+    A set of "If P, Q" rules parsed once into hash indexes:
+    forward maps each antecedent to its consequents and backward maps each
+    consequent to its antecedents. Queries are dictionary lookups, so batches
+    of premises can be answered without re-parsing any implication text.
+    """
+    def __init__(self, implications=()):
+        self.forward = collections.defaultdict(set)
+        self.backward = collections.defaultdict(set)
+        for implication in implications:
+            self.add(implication)
+
+    def add(self, implication):
+        parsed = _parse_implication(implication)
+        if parsed is None:
+            raise ValueError(f"Invalid implication format: {implication!r}. Use: 'If P, Q'")
+        antecedent, consequent = parsed
+        self.forward[antecedent].add(consequent)
+        self.backward[consequent].add(antecedent)
+
+    def modus_ponens(self, premises):
+        """One inference step per premise: {premise: [consequents]}."""
+        forward = self.forward
+        results = {}
+        for premise in premises:
+            found = forward.get(_normalize(premise))
+            results[premise] = sorted(found) if found else []
+        return results
+
+    def modus_tollens(self, negated_consequents):
+        """
+        One inference step per "Not Q": {input: [antecedents that must be false]}.
+        Inputs that are not negations map to None.
+        """
+        backward = self.backward
+        results = {}
+        for text in negated_consequents:
+            consequent = _strip_negation(text)
+            if consequent is None:
+                results[text] = None
+            else:
+                found = backward.get(consequent)
+                results[text] = sorted(found) if found else []
+        return results
+
+    @staticmethod
+    def _closure(index, start):
+        # Breadth-first walk: each proposition is expanded at most once.
+        known = set(start)
+        frontier = collections.deque(known)
+        while frontier:
+            for nxt in index.get(frontier.popleft(), ()):
+                if nxt not in known:
+                    known.add(nxt)
+                    frontier.append(nxt)
+        return known
+
+    def forward_closure(self, premises):
+        """Everything that follows from the premises by chained Modus Ponens."""
+        return self._closure(self.forward, (_normalize(p) for p in premises))
+
+    def contrapositive_closure(self, negated_consequents):
+        """
+        Everything that must be false given the "Not Q" inputs, by chained
+        Modus Tollens. Inputs that are not negations are ignored.
+        """
+        negated = (_strip_negation(text) for text in negated_consequents)
+        return self._closure(self.backward, (p for p in negated if p is not None))
+
+
 def resolve_clauses(clause1, clause2):
     # Remove literals with same variable, opposite signs
     result = set(clause1)
@@ -71,22 +173,788 @@ def resolution_solver(clauses):
 
 def parse_input(input_str):
     try:
-        clauses = eval(input_str)
+        # literal_eval only accepts Python literals, so no code is ever executed.
+        clauses = ast.literal_eval(input_str)
         if not isinstance(clauses, list) or not all(isinstance(c, tuple) for c in clauses):
             raise ValueError
         return clauses
-    except:
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        # literal_eval raises TypeError on e.g. unhashable set members and
+        # MemoryError/RecursionError on deeply nested input.
         print("❌ Invalid input. Enter clauses as a list of tuples. Example: [(1, -2), (-1, 3)]")
         return None
 
 
+# ----------- DIMACS CNF Loading --------------
+
+class CNF:
+    """
+    A clause set stored as one flat int32 array of literals plus an offsets array.
+    Clause i is literals[offsets[i]:offsets[i + 1]], using the same signed-integer
+    literal convention as resolve_clauses (3 means x3, -3 means not x3).
+    """
+    def __init__(self, num_vars=0):
+        self.num_vars = num_vars
+        self.literals = array("i")
+        self.offsets = array("q", [0])
+        # Filled in by load_dimacs: bytes, seconds, clauses/sec, MB/sec.
+        self.parse_stats = {}
+
+    @classmethod
+    def from_clauses(cls, clauses):
+        """Builds a CNF from any iterable of literal tuples, e.g. [(1, -2), (-1, 3)]."""
+        cnf = cls()
+        for clause in clauses:
+            cnf.add_clause(clause)
+        return cnf
+
+    def add_clause(self, clause):
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+        for lit in clause:
+            if abs(lit) > self.num_vars:
+                self.num_vars = abs(lit)
+
+    def clause(self, i):
+        return tuple(self.literals[self.offsets[i]:self.offsets[i + 1]])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        # Yields plain tuples, so existing code that expects a list of tuples still works.
+        lits, offs = self.literals, self.offsets
+        for i in range(len(offs) - 1):
+            yield tuple(lits[offs[i]:offs[i + 1]])
+
+
+def as_cnf(clauses):
+    """Accepts either a CNF or a list of tuples and always returns a CNF."""
+    if isinstance(clauses, CNF):
+        return clauses
+    return CNF.from_clauses(clauses)
+
+
+# Comment ('c'), problem ('p') and SATLIB end-marker ('%') lines.
+_DIMACS_SPECIAL_LINE = re.compile(rb"^[ \t]*[cp%].*$", re.MULTILINE)
+
+
+def load_dimacs(path, chunk_size=1 << 22):
+    """
+    Streams a DIMACS .cnf file into a CNF without building per-clause tuples.
+    The file is read in large binary chunks and whole chunks of clause data are
+    converted to integers in one go; clause boundaries (the 0 terminators) are
+    located with iterator tools that run in C.
+    Raises ValueError on a malformed file.
+    """
+    start_time = time.perf_counter()
+    cnf = CNF()
+    declared_vars = declared_clauses = None
+    literals, offsets = cnf.literals, cnf.offsets
+    position = 0           # Index in the raw integer stream, 0 terminators included.
+    carry = b""            # Partial line left over from the previous chunk.
+    total_bytes = 0
+
+    def consume(ints):
+        # Clause k ends at the k-th 0 in the raw stream, and exactly k zeros precede
+        # it, so its end offset in the zero-free literal array is position - k.
+        # compress/map/filter keep the whole split in C, with no per-clause Python loop.
+        nonlocal position
+        ends = compress(count(position), map(not_, ints))
+        offsets.extend(map(sub, ends, count(len(offsets) - 1)))
+        literals.extend(filter(None, ints))
+        position += len(ints)
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            total_bytes += len(chunk)
+            if not chunk:
+                data, carry = carry, b""
+            else:
+                data = carry + chunk
+                cut = data.rfind(b"\n") + 1
+                data, carry = data[:cut], data[cut:]
+
+            # Comment, header and end-marker lines are rare, so they are located
+            # with a regex and cut out; the remaining clause text of the whole chunk
+            # is converted to integers in a single call.
+            pieces, last = [], 0
+            for match in _DIMACS_SPECIAL_LINE.finditer(data):
+                pieces.append(data[last:match.start()])
+                last = match.end()
+                line = match.group().lstrip()
+                if line.startswith(b"%"):
+                    # SATLIB files end with a '%' line followed by junk.
+                    chunk = b""
+                    last = len(data)
+                    break
+                if line.startswith(b"p"):
+                    fields = line.split()
+                    if len(fields) != 4 or fields[1] != b"cnf":
+                        raise ValueError(f"Bad problem line: {line.decode(errors='replace')}")
+                    declared_vars, declared_clauses = int(fields[2]), int(fields[3])
+            if pieces:
+                pieces.append(data[last:])
+                data = b"\n".join(pieces)
+            try:
+                consume(list(map(int, data.split())))
+            except ValueError:
+                raise ValueError(f"Malformed clause data in {path}") from None
+
+            if not chunk:
+                break
+
+    # A final clause without its terminating 0 is still accepted.
+    if len(literals) > offsets[-1]:
+        offsets.append(len(literals))
+
+    if declared_vars is None:
+        raise ValueError(f"No 'p cnf' header found in {path}")
+    cnf.num_vars = declared_vars
+    if literals:
+        largest = max(max(literals), -min(literals))
+        if largest > declared_vars:
+            raise ValueError(f"Literal {largest} exceeds declared variable count {declared_vars}")
+    if len(cnf) != declared_clauses:
+        print(f"Warning: header declares {declared_clauses} clauses, file contains {len(cnf)}.")
+
+    elapsed = time.perf_counter() - start_time
+    cnf.parse_stats = {
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "clauses_per_sec": len(cnf) / elapsed if elapsed > 0 else float("inf"),
+        "mb_per_sec": total_bytes / 1e6 / elapsed if elapsed > 0 else float("inf"),
+    }
+    return cnf
+
+
+# ----------- CDCL SAT Solver --------------
+# Literals use the same signed-integer convention as resolve_clauses on the way in
+# and out. Internally literal v becomes index 2*v and literal -v becomes 2*v + 1,
+# so negation is a single XOR with 1 and per-literal data lives in flat lists.
+
+def _to_index(lit):
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+
+def _to_lit(index):
+    var = index >> 1
+    return -var if index & 1 else var
+
+
+def _luby(i):
+    """Returns the i-th (0-based) term of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 2 ** seq
+
+
+class _Clause:
+    """A problem or learned clause. lits[0] and lits[1] are the two watched literals."""
+    __slots__ = ("lits", "learnt", "activity", "deleted")
+
+    def __init__(self, lits, learnt):
+        self.lits = lits
+        self.learnt = learnt
+        self.activity = 0.0
+        # Deleted clauses are dropped lazily from the watch lists during propagation.
+        self.deleted = False
+
+
+class CDCLSolver:
+    """
+    Conflict-driven clause learning SAT solver.
+    - Unit propagation with two watched literals per clause.
+    - First-UIP conflict analysis with learned-clause minimization.
+    - VSIDS variable activity with phase saving for decisions.
+    - Luby restarts and activity-based deletion of learned clauses.
+    Counters for decisions, propagations, conflicts, restarts and learned/deleted
+    clauses are kept in self.stats.
+    The solver is incremental: add_clause may be called between solve calls and
+    solve(assumptions=[...]) checks the clauses under temporary unit assumptions,
+    reporting an unsat core over those assumptions in self.core.
+    """
+    def __init__(self, clauses=(), restart_base=100, var_decay=0.95, clause_decay=0.999):
+        self.restart_base = restart_base
+        self.var_decay = var_decay
+        self.clause_decay = clause_decay
+
+        self.num_vars = 0
+        # Per literal index (index 0 and 1 belong to the unused variable 0).
+        self.values = [0, 0]        # 1 = true, -1 = false, 0 = unassigned
+        self.watches = [[], []]     # watches[p]: clauses to visit when p becomes true
+        # Per variable.
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.polarity = [True]      # Saved phase; True means try the negative literal.
+        self.seen = [False]
+
+        self.clauses = []
+        self.learnts = []
+        self.trail = []
+        self.trail_lim = []         # Trail position where each decision level starts.
+        self.qhead = 0
+        self.order_heap = []        # (-activity, var) entries, lazily cleaned up.
+        self.var_inc = 1.0
+        self.cla_inc = 1.0
+        self.max_learnts = 0
+        self.ok = True              # Becomes False once the clause set is known UNSAT.
+        self.model = None
+        self.core = None
+        self.stats = {"solves": 0, "decisions": 0, "propagations": 0, "conflicts": 0,
+                      "restarts": 0, "learned": 0, "deleted": 0}
+
+        if isinstance(clauses, CNF):
+            # Read straight from the flat arrays instead of building tuples.
+            lits, offs = clauses.literals, clauses.offsets
+            self._ensure_vars(clauses.num_vars)
+            for i in range(len(offs) - 1):
+                self.add_clause(lits[offs[i]:offs[i + 1]])
+        else:
+            for clause in clauses:
+                self.add_clause(clause)
+
+    # --- Problem setup ---
+
+    def _ensure_vars(self, n):
+        while self.num_vars < n:
+            self.num_vars += 1
+            self.values += [0, 0]
+            self.watches += [[], []]
+            self.level.append(0)
+            self.reason.append(None)
+            self.activity.append(0.0)
+            self.polarity.append(True)
+            self.seen.append(False)
+            heapq.heappush(self.order_heap, (0.0, self.num_vars))
+
+    def add_clause(self, clause):
+        """
+        Adds a clause of signed integer literals.
+        Returns False if the clause set has become unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        # New clauses are only attached at the root level.
+        self._cancel_until(0)
+        values = self.values
+        lits = []
+        for lit in clause:
+            if lit == 0:
+                raise ValueError("0 is not a valid literal")
+            if abs(lit) > self.num_vars:
+                self._ensure_vars(abs(lit))
+            index = _to_index(lit)
+            if values[index] == 1 or (index ^ 1) in lits:
+                return True     # Already satisfied at the root, or a tautology.
+            if values[index] == 0 and index not in lits:
+                lits.append(index)
+
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            c = _Clause(lits, False)
+            self.clauses.append(c)
+            self._attach(c)
+        return self.ok
+
+    def _attach(self, c):
+        self.watches[c.lits[0] ^ 1].append(c)
+        self.watches[c.lits[1] ^ 1].append(c)
+
+    # --- Assignment trail ---
+
+    def _enqueue(self, index, reason):
+        self.values[index] = 1
+        self.values[index ^ 1] = -1
+        var = index >> 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(index)
+
+    def _cancel_until(self, level):
+        """Undoes every assignment above the given decision level."""
+        if len(self.trail_lim) <= level:
+            return
+        values, activity, heap = self.values, self.activity, self.order_heap
+        start = self.trail_lim[level]
+        for index in self.trail[start:]:
+            var = index >> 1
+            values[index] = values[index ^ 1] = 0
+            self.reason[var] = None
+            self.polarity[var] = bool(index & 1)
+            heapq.heappush(heap, (-activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = start
+        self._trim_order_heap()
+
+    def _trim_order_heap(self):
+        """
+        Every unassignment and bump pushes a fresh heap entry, and stale ones
+        are only dropped when they reach the top. Once the heap holds more
+        than about twice as many entries as there are variables, it is rebuilt
+        from the unassigned variables, so its size tracks num_vars rather than
+        the total amount of backtracking. The rebuild is amortized O(1) per push.
+        """
+        if len(self.order_heap) > 2 * self.num_vars + 64:
+            self._rebuild_order_heap()
+
+    def _rebuild_order_heap(self):
+        activity, values = self.activity, self.values
+        # Rebuilt in place: callers may hold a reference to the list.
+        self.order_heap[:] = [(-activity[v], v) for v in range(1, self.num_vars + 1)
+                              if values[2 * v] == 0]
+        heapq.heapify(self.order_heap)
+
+    def _propagate(self):
+        """
+        Two-watched-literal unit propagation.
+        Returns the conflicting clause, or None if no conflict was found.
+        """
+        values, watches, trail = self.values, self.watches, self.trail
+        processed = 0
+        while self.qhead < len(trail):
+            p = trail[self.qhead]
+            self.qhead += 1
+            processed += 1
+            false_lit = p ^ 1
+            ws = watches[p]
+            watches[p] = kept = []
+            i, n = 0, len(ws)
+            while i < n:
+                c = ws[i]
+                i += 1
+                if c.deleted:
+                    continue
+                lits = c.lits
+                # Make sure the false literal is lits[1].
+                if lits[0] == false_lit:
+                    lits[0], lits[1] = lits[1], false_lit
+                first = lits[0]
+                if values[first] == 1:
+                    kept.append(c)
+                    continue
+                # Look for a replacement watch that is not false.
+                for k in range(2, len(lits)):
+                    other = lits[k]
+                    if values[other] != -1:
+                        lits[1], lits[k] = other, false_lit
+                        watches[other ^ 1].append(c)
+                        break
+                else:
+                    # The clause is unit or conflicting under the current assignment.
+                    kept.append(c)
+                    if values[first] == -1:
+                        kept.extend(ws[i:])
+                        self.qhead = len(trail)
+                        self.stats["propagations"] += processed
+                        return c
+                    self._enqueue(first, c)
+        self.stats["propagations"] += processed
+        return None
+
+    # --- Conflict analysis ---
+
+    def _bump_var(self, var):
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > 1e100:
+            # Rescale everything and rebuild the heap so priorities stay comparable.
+            for v in range(1, self.num_vars + 1):
+                activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self._rebuild_order_heap()
+        elif self.values[2 * var] == 0:
+            heapq.heappush(self.order_heap, (-activity[var], var))
+            self._trim_order_heap()
+
+    def _bump_clause(self, c):
+        c.activity += self.cla_inc
+        if c.activity > 1e20:
+            for learnt in self.learnts:
+                learnt.activity *= 1e-20
+            self.cla_inc *= 1e-20
+
+    def _analyze(self, confl):
+        """
+        First-UIP conflict analysis.
+        Returns the learned clause (asserting literal first) and the backjump level.
+        """
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        current_level = len(self.trail_lim)
+        learnt = [None]
+        path_count = 0
+        p = None
+        idx = len(trail) - 1
+
+        while True:
+            if confl.learnt:
+                self._bump_clause(confl)
+            # For reason clauses lits[0] is the implied literal itself; skip it.
+            for q in (confl.lits if p is None else confl.lits[1:]):
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self._bump_var(var)
+                    if level[var] >= current_level:
+                        path_count += 1
+                    else:
+                        learnt.append(q)
+            # Walk back along the trail to the next marked literal.
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = False
+            path_count -= 1
+            if path_count == 0:
+                break
+        learnt[0] = p ^ 1
+
+        # Drop literals whose reason is already implied by the rest of the clause.
+        marked = learnt[1:]
+        minimized = [learnt[0]]
+        for q in marked:
+            r = reason[q >> 1]
+            if r is None or any(not seen[x >> 1] and level[x >> 1] > 0 for x in r.lits[1:]):
+                minimized.append(q)
+        for q in marked:
+            seen[q >> 1] = False
+
+        # Backjump to the second-highest level, keeping that literal at position 1
+        # so it becomes the clause's second watch.
+        if len(minimized) == 1:
+            return minimized, 0
+        best = max(range(1, len(minimized)), key=lambda k: level[minimized[k] >> 1])
+        minimized[1], minimized[best] = minimized[best], minimized[1]
+        return minimized, level[minimized[1] >> 1]
+
+    def _reduce_db(self):
+        """Deletes the less active half of the learned clauses."""
+        self.learnts.sort(key=lambda c: c.activity)
+        half = len(self.learnts) // 2
+        kept = []
+        for i, c in enumerate(self.learnts):
+            locked = self.reason[c.lits[0] >> 1] is c
+            if i < half and len(c.lits) > 2 and not locked:
+                c.deleted = True
+                self.stats["deleted"] += 1
+            else:
+                kept.append(c)
+        self.learnts = kept
+
+    # --- Search ---
+
+    def _pick_branch(self):
+        heap, values = self.order_heap, self.values
+        while heap:
+            var = heapq.heappop(heap)[1]
+            if values[2 * var] == 0:
+                return 2 * var + (1 if self.polarity[var] else 0)
+        return None
+
+    def _search(self, conflict_budget, assumptions):
+        """
+        Runs CDCL until SAT (True), UNSAT (False) or the conflict budget
+        for this restart is used up (None).
+        """
+        stats = self.stats
+        conflicts = 0
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                stats["conflicts"] += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    return False
+                learnt, backjump_level = self._analyze(confl)
+                self._cancel_until(backjump_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    c = _Clause(learnt, True)
+                    self.learnts.append(c)
+                    self._attach(c)
+                    self._bump_clause(c)
+                    self._enqueue(learnt[0], c)
+                stats["learned"] += 1
+                self.var_inc /= self.var_decay
+                self.cla_inc /= self.clause_decay
+            else:
+                if conflicts >= conflict_budget:
+                    self._cancel_until(0)
+                    return None
+                if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                    self._reduce_db()
+                    # Let the database grow slowly so hard instances keep more clauses.
+                    self.max_learnts *= 1.1
+                # Assumptions are decided first, one decision level each.
+                decision = None
+                while len(self.trail_lim) < len(assumptions):
+                    p = assumptions[len(self.trail_lim)]
+                    if self.values[p] == 1:
+                        # Already true: open an empty level to keep levels aligned.
+                        self.trail_lim.append(len(self.trail))
+                    elif self.values[p] == -1:
+                        self.core = self._analyze_final(p)
+                        return False
+                    else:
+                        decision = p
+                        break
+                if decision is None:
+                    decision = self._pick_branch()
+                    if decision is None:
+                        return True
+                stats["decisions"] += 1
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(decision, None)
+
+    def _analyze_final(self, p):
+        """
+        Called when assumption p is false under the earlier assumptions.
+        Returns the subset of assumptions (as signed literals) that forces it.
+        """
+        seen, reason, level = self.seen, self.reason, self.level
+        core = [_to_lit(p)]
+        if not self.trail_lim:
+            return core
+        seen[p >> 1] = True
+        for i in range(len(self.trail) - 1, self.trail_lim[0] - 1, -1):
+            index = self.trail[i]
+            var = index >> 1
+            if not seen[var]:
+                continue
+            if reason[var] is None:
+                # Decisions at these levels are exactly the assumptions.
+                core.append(_to_lit(index))
+            else:
+                for q in reason[var].lits[1:]:
+                    if level[q >> 1] > 0:
+                        seen[q >> 1] = True
+            seen[var] = False
+        seen[p >> 1] = False
+        return core
+
+    def solve(self, assumptions=()):
+        """
+        Returns a model as a list of signed literals (e.g. [1, -2, 3]),
+        or None if the clauses are unsatisfiable under the given assumptions.
+        After an UNSAT answer self.core holds the assumptions responsible
+        (empty if the clauses are UNSAT on their own).
+        The solver can be reused: learned clauses, variable activity and saved
+        phases carry over to later add_clause/solve calls.
+        """
+        self.model = None
+        self.core = None
+        self.stats["solves"] += 1
+        if not self.ok:
+            self.core = []
+            return None
+        for lit in assumptions:
+            if abs(lit) > self.num_vars:
+                self._ensure_vars(abs(lit))
+        assumptions = [_to_index(lit) for lit in assumptions]
+        self.max_learnts = max(self.max_learnts, len(self.clauses) / 3, 2000)
+        restart = 0
+        while True:
+            status = self._search(_luby(restart) * self.restart_base, assumptions)
+            if status is not None:
+                break
+            restart += 1
+            self.stats["restarts"] += 1
+
+        if status:
+            values = self.values
+            self.model = [v if values[2 * v] == 1 else -v for v in range(1, self.num_vars + 1)]
+        elif self.core is None:
+            # The conflict did not depend on any assumption.
+            self.ok = False
+            self.core = []
+        self._cancel_until(0)
+        return self.model
+
+
+def cdcl_solver(clauses):
+    """
+    Checks satisfiability of a list of tuples or a CNF with the CDCL solver.
+    Returns (model, stats); model is None when the clauses are UNSAT.
+    """
+    solver = CDCLSolver(clauses)
+    model = solver.solve()
+    return model, solver.stats
+
+
+# ----------- Resolution Refutation (Given-Clause) --------------
+
+def resolution_refutation(clauses, support=None, max_clauses=10000, time_limit=10.0):
+    """
+    Saturates a clause set with binary resolution using the given-clause algorithm.
+    - support: clauses forming the set of support (e.g. the negated goal). They are
+      added to the input clauses. If omitted, the all-negative input clauses are used,
+      which keeps the strategy complete.
+    - Clauses are indexed by literal, so resolution partners and subsumption
+      candidates are found by lookup instead of pairwise scans.
+    - Tautologies are discarded; forward and backward subsumption keep the set small.
+    Returns (status, proof, stats), where status is "unsat" (empty clause derived),
+    "saturated" (no new clauses; satisfiable when the non-support clauses are) or
+    "unknown" (clause or time limit hit). proof lists (clause, parent1, parent2)
+    steps ending in the empty clause when status is "unsat".
+    """
+    start_time = time.perf_counter()
+    stats = {"given": 0, "generated": 0, "kept": 0, "tautologies": 0,
+             "forward_subsumed": 0, "backward_subsumed": 0, "seconds": 0.0}
+
+    clause_of = {}                                  # id -> frozenset of literals
+    parents = {}                                    # id -> (parent id, parent id) or None
+    occurs = collections.defaultdict(set)           # literal -> ids of all live clauses
+    usable_occurs = collections.defaultdict(set)    # literal -> ids of usable clauses
+    usable = set()
+    sos_heap = []                                   # (clause length, id), lightest first
+    next_id = count()
+
+    def proof_of(clause_id):
+        # Collect the derivation of a clause in the order its steps were made.
+        steps, stack, done = [], [clause_id], set()
+        while stack:
+            cid = stack.pop()
+            if cid in done:
+                continue
+            done.add(cid)
+            pair = parents[cid]
+            if pair is not None:
+                steps.append(cid)
+                stack.extend(pair)
+        steps.sort()
+        return [(tuple(sorted(clause_of[cid])),
+                 tuple(sorted(clause_of[parents[cid][0]])),
+                 tuple(sorted(clause_of[parents[cid][1]]))) for cid in steps]
+
+    def is_subsumed(lits):
+        # Forward subsumption: any live clause that is a subset of lits.
+        for lit in lits:
+            for cid in occurs[lit]:
+                if clause_of[cid] <= lits:
+                    return True
+        return False
+
+    def remove(cid):
+        for lit in clause_of[cid]:
+            occurs[lit].discard(cid)
+            usable_occurs[lit].discard(cid)
+        usable.discard(cid)
+
+    def backward_subsume(cid, lits):
+        # Clauses containing every literal of lits are the intersection of the
+        # occurrence sets, starting from the rarest literal.
+        candidates = None
+        for lit in sorted(lits, key=lambda l: len(occurs[l])):
+            candidates = set(occurs[lit]) if candidates is None else candidates & occurs[lit]
+            if not candidates:
+                return
+        for other in candidates:
+            if other != cid:
+                remove(other)
+                stats["backward_subsumed"] += 1
+
+    def add_clause(lits, pair, into_usable=False):
+        """Returns the new clause id, or None if the clause was discarded."""
+        if any(-lit in lits for lit in lits):
+            stats["tautologies"] += 1
+            return None
+        if lits and is_subsumed(lits):
+            stats["forward_subsumed"] += 1
+            return None
+        cid = next(next_id)
+        clause_of[cid] = lits
+        parents[cid] = pair
+        stats["kept"] += 1
+        if not lits:
+            return cid
+        backward_subsume(cid, lits)
+        for lit in lits:
+            occurs[lit].add(cid)
+        if into_usable:
+            usable.add(cid)
+            for lit in lits:
+                usable_occurs[lit].add(cid)
+        else:
+            heapq.heappush(sos_heap, (len(lits), cid))
+        return cid
+
+    def finish(status, proof):
+        stats["seconds"] = time.perf_counter() - start_time
+        return status, proof, stats
+
+    # --- Load the input: usable clauses first, then the set of support ---
+    clauses = [frozenset(c) for c in clauses]
+    if support is None:
+        support_clauses = [c for c in clauses if all(lit < 0 for lit in c)]
+        clauses = [c for c in clauses if any(lit > 0 for lit in c)]
+    else:
+        support_clauses = [frozenset(c) for c in support]
+
+    for lits in clauses + support_clauses:
+        if not lits:
+            return finish("unsat", [])
+    for lits in clauses:
+        # Non-support clauses go straight to usable; they never resolve together.
+        add_clause(lits, None, into_usable=True)
+    for lits in support_clauses:
+        add_clause(lits, None)
+
+    # --- Given-clause loop ---
+    while sos_heap:
+        if time.perf_counter() - start_time > time_limit or len(clause_of) > max_clauses:
+            return finish("unknown", [])
+        _, given = heapq.heappop(sos_heap)
+        given_lits = clause_of[given]
+        if given not in occurs[next(iter(given_lits))]:
+            continue        # Backward-subsumed while waiting in the set of support.
+        stats["given"] += 1
+
+        # Move the given clause into usable, then resolve it against every usable
+        # clause that holds a complementary literal (itself included).
+        usable.add(given)
+        for lit in given_lits:
+            usable_occurs[lit].add(given)
+        for lit in given_lits:
+            for partner in list(usable_occurs[-lit]):
+                if given not in usable:
+                    break   # The given clause was subsumed by one of its resolvents.
+                if partner not in usable:
+                    continue
+                stats["generated"] += 1
+                resolvent = (given_lits - {lit}) | (clause_of[partner] - {-lit})
+                cid = add_clause(resolvent, (given, partner))
+                if cid is not None and not resolvent:
+                    return finish("unsat", proof_of(cid))
+
+    return finish("saturated", [])
+
+
 # ----------- Test Interactively --------------
 if __name__ == "__main__":
     print("Choose logic rule:")
     print("1. Modus Ponens")
     print("2. Modus Tollens")
     print("3. Unit Resolution")
-    choice = input("Enter 1/2/3: ")
+    print("4. Load DIMACS CNF file")
+    print("5. Resolution Refutation")
+    print("6. Implication Knowledge Base (chained inference)")
+    choice = input("Enter 1/2/3/4/5/6: ")
 
     if choice == "1":
         implication = input("Enter implication (e.g., 'If it rains, the ground is wet'): ")
@@ -109,5 +977,61 @@ if __name__ == "__main__":
         if clauses:
             result = resolution_solver(clauses)
             print("🧠 Result:", result)
+
+    elif choice == "4":
+        path = input("Path to .cnf file: ").strip()
+        try:
+            cnf = load_dimacs(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load CNF: {e}")
+        else:
+            stats = cnf.parse_stats
+            print(f"Loaded {len(cnf)} clauses over {cnf.num_vars} variables "
+                  f"in {stats['seconds']:.3f}s "
+                  f"({stats['clauses_per_sec']:,.0f} clauses/s, {stats['mb_per_sec']:.1f} MB/s)")
+            model, stats = cdcl_solver(cnf)
+            if model is None:
+                print("🧠 Result: UNSAT")
+            else:
+                print("🧠 Result: SAT")
+                print("Model:", " ".join(map(str, model)))
+            print(f"Decisions: {stats['decisions']}, Propagations: {stats['propagations']}, "
+                  f"Conflicts: {stats['conflicts']}, Restarts: {stats['restarts']}")
+
+    elif choice == "5":
+        print("Enter your clauses as a list of tuples, e.g.: [(1, -2), (-1, 3), (2, 3), (-3,)]")
+        clauses = parse_input(input("Clauses: "))
+
+        if clauses:
+            status, proof, stats = resolution_refutation(clauses)
+            for clause, left, right in proof:
+                print(f"  {left} + {right} => {clause}")
+            print("🧠 Result:", {"unsat": "Contradiction (empty clause)",
+                                 "saturated": "Saturated, no contradiction",
+                                 "unknown": "Limit reached, undecided"}[status])
+            print(f"Given: {stats['given']}, Generated: {stats['generated']}, Kept: {stats['kept']}, "
+                  f"Subsumed: {stats['forward_subsumed'] + stats['backward_subsumed']}")
+
+    elif choice == "6":
+        kb = ImplicationKB()
+        print("Enter implications one per line (e.g., 'If it rains, the ground is wet'). Blank line to finish.")
+        while True:
+            line = input("Implication: ").strip()
+            if not line:
+                break
+            try:
+                kb.add(line)
+            except ValueError as e:
+                print(f"❌ {e}")
+
+        facts = input("Known premises, separated by ';': ").split(";")
+        facts = [f for f in facts if f.strip()]
+        if facts:
+            print("Therefore (Modus Ponens):", ", ".join(sorted(kb.forward_closure(facts))))
+
+        negations = input("Known negated consequents (e.g., 'Not Q'), separated by ';': ").split(";")
+        negations = [n for n in negations if n.strip()]
+        if negations:
+            print("Therefore not (Modus Tollens):", ", ".join(sorted(kb.contrapositive_closure(negations))))
     else:
         print("Invalid choice.")
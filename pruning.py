@@ -1,6 +1,5 @@
 import math
-import networkx as nx
-import matplotlib.pyplot as plt
+from plotting import cached_layout, draw_graph, is_headless, load_plotting
 import collections
 
 class Node:
@@ -107,7 +106,12 @@ def build_graph(node, graph):
         graph.add_edge(node.name, child.name)
         build_graph(child, graph)
 
-def display_with_networkx(root):
+def display_with_networkx(root, output=None):
+    if output is None and is_headless():
+        print("Headless mode: skipping tree display.")
+        return
+
+    nx, _ = load_plotting()
     G = nx.DiGraph()
     build_graph(root, G)
 
@@ -127,17 +131,12 @@ def display_with_networkx(root):
     edge_styles = ['dashed' if node_map.get(v).is_pruned else 'solid' for u, v in G.edges()]
     node_colors = ['lightgray' if node_map.get(n).is_pruned else 'skyblue' for n in G.nodes()]
 
-    try:
-        pos = nx.drawing.nx_pydot.graphviz_layout(G, prog='dot')
-    except ImportError:
-        pos = nx.spring_layout(G)
+    pos = cached_layout(G, tree=True)
 
-    plt.figure(figsize=(12, 8))
-    nx.draw(G, pos, labels=labels, with_labels=True, arrows=False,
-            node_size=3000, node_color=node_colors, font_size=10,
-            font_weight='bold', width=2.0, edge_color=edge_colors, style=edge_styles)
-    plt.title("Minimax Tree with Alpha-Beta Pruning")
-    plt.show()
+    draw_graph(G, pos, "Minimax Tree with Alpha-Beta Pruning", output=output,
+               figsize=(12, 8), labels=labels, with_labels=True, arrows=False,
+               node_size=3000, node_color=node_colors, font_size=10,
+               font_weight='bold', width=2.0, edge_color=edge_colors, style=edge_styles)
 
 # --- Main Program Execution ---
 if __name__ == "__main__":
@@ -152,4 +151,4 @@ if __name__ == "__main__":
         print(f"\nOptimal value at the root is: {root.minimax_value}")
         print(f"The best path is: {' -> '.join(path)}")
         print("Displaying the pruned tree...")
-        display_with_networkx(root)
\ No newline at end of file
+        display_with_networkx(root, output="alphabeta_tree.png" if is_headless() else None)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import itertools
+import numpy as np
+from tsp import DistanceMatrix, EuclideanInstance
+
+# --- Tour evaluation for the TSP scripts ---
+# Scores and checks many candidate tours at once, and prices single moves
+# without walking the tour. Tours are handled as rows of city indices into a
+# DistanceMatrix or EuclideanInstance: a batch of m tours over n cities is an
+# (m, n) integer array, and its m * n legs are looked up in one gather.
+
+# Rows per block in the batch functions, sized so one block's temporary
+# arrays stay around 32 MB whatever the tour length.
+_BLOCK_ELEMENTS = 1 << 22
+
+def as_distances(graph):
+    """A DistanceMatrix for a graph[city1][city2] = cost dict; instances pass through."""
+    if isinstance(graph, (DistanceMatrix, EuclideanInstance)):
+        return graph
+    return DistanceMatrix.from_graph(graph)
+
+def tour_array(dist, tours):
+    """
+    Converts tours to an (m, n) array of city indices. tours is either an
+    integer array of indices already, or a list of tours given as lists of
+    city names. A closed tour (first city repeated at the end) loses its
+    last entry. Raises ValueError for unknown cities, indices out of range,
+    or tours of different lengths.
+    """
+    if isinstance(tours, np.ndarray) and tours.dtype.kind in "iu":
+        array = np.atleast_2d(tours).astype(np.intp, copy=False)
+        if array.size and (array.min() < 0 or array.max() >= len(dist)):
+            raise ValueError("City index out of range.")
+        if array.shape[1] > 1 and np.all(array[:, 0] == array[:, -1]):
+            array = array[:, :-1]
+        return array
+    tours = [tour[:-1] if len(tour) > 1 and tour[0] == tour[-1] else tour for tour in tours]
+    lengths = {len(tour) for tour in tours}
+    if len(lengths) > 1:
+        raise ValueError("All tours in a batch must visit the same number of cities.")
+    length = lengths.pop() if lengths else 0
+    try:
+        flat = np.fromiter(map(dist.index.__getitem__, itertools.chain.from_iterable(tours)),
+                           np.intp, len(tours) * length)
+    except KeyError as error:
+        raise ValueError(f"City {error} not found in the graph.") from None
+    return flat.reshape(len(tours), length)
+
+def _leg_blocks(dist, tours):
+    """Yields (row slice, leg costs) blocks; leg k of a tour runs from city k to city k + 1."""
+    rows = max(_BLOCK_ELEMENTS // max(tours.shape[1], 1), 1)
+    for start in range(0, len(tours), rows):
+        block = tours[start:start + rows]
+        following = np.roll(block, -1, axis=1)
+        if isinstance(dist, DistanceMatrix):
+            legs = dist.matrix[block, following]
+        else:
+            legs = dist.pair_distances(block, following)
+        yield slice(start, start + len(block)), legs
+
+# --- Batch Scoring and Validation ---
+
+def tour_costs(graph, tours):
+    """
+    Total cost of every tour in a batch as a float array, inf where a tour
+    uses a missing edge. graph is a dict graph, DistanceMatrix or
+    EuclideanInstance; tours as for tour_array.
+    """
+    dist = as_distances(graph)
+    tours = tour_array(dist, tours)
+    costs = np.zeros(len(tours))
+    for rows, legs in _leg_blocks(dist, tours):
+        costs[rows] = legs.sum(axis=1)
+    return costs
+
+def check_tours(graph, tours):
+    """
+    Validates a batch of tours without a Python loop over cities. Returns a
+    dict of per-tour arrays: 'duplicates' (repeat visits), 'unvisited'
+    (cities never visited), 'missing_edges' (legs with no edge in the
+    graph), 'cost' (inf if an edge is missing) and 'valid'.
+    """
+    dist = as_distances(graph)
+    tours = tour_array(dist, tours)
+    # Repeat visits show up as equal neighbors once each row is sorted.
+    ordered = np.sort(tours, axis=1)
+    duplicates = np.count_nonzero(ordered[:, 1:] == ordered[:, :-1], axis=1)
+    unvisited = len(dist) - (tours.shape[1] - duplicates)
+    missing_edges = np.zeros(len(tours), dtype=np.intp)
+    costs = np.zeros(len(tours))
+    for rows, legs in _leg_blocks(dist, tours):
+        missing_edges[rows] = np.count_nonzero(~np.isfinite(legs), axis=1)
+        costs[rows] = legs.sum(axis=1)
+    return {
+        "duplicates": duplicates,
+        "unvisited": unvisited,
+        "missing_edges": missing_edges,
+        "cost": costs,
+        "valid": (duplicates == 0) & (unvisited == 0) & (missing_edges == 0),
+    }
+
+# --- Incremental Move Costs ---
+# tour is one row of city indices (a list or array, not closed) and dist has
+# distance(i, j) on indices, e.g. from as_distances. Each function looks at
+# the handful of legs a move touches, so the cost is O(1) in the tour length.
+
+def reversal_delta(dist, tour, i, j):
+    """
+    Cost change from reversing the tour between positions i and j
+    (inclusive, wrapping around), i.e. a 2-opt move. Assumes symmetric costs.
+    """
+    n = len(tour)
+    if (j - i) % n + 1 >= n - 1:
+        # Reversing all cities but at most one gives the same cycle.
+        return 0.0
+    a, b = tour[(i - 1) % n], tour[i % n]
+    c, d = tour[j % n], tour[(j + 1) % n]
+    return dist.distance(a, c) + dist.distance(b, d) - dist.distance(a, b) - dist.distance(c, d)
+
+def swap_delta(dist, tour, i, j):
+    """Cost change from exchanging the cities at positions i and j."""
+    n = len(tour)
+    i, j = i % n, j % n
+    if i == j:
+        return 0.0
+    # Leg k runs from position k to k + 1; only legs next to i or j change.
+    legs = {(i - 1) % n, i, (j - 1) % n, j}
+
+    def swapped(k):
+        k %= n
+        return tour[j] if k == i else tour[i] if k == j else tour[k]
+
+    before = sum(dist.distance(tour[k], tour[(k + 1) % n]) for k in legs)
+    after = sum(dist.distance(swapped(k), swapped(k + 1)) for k in legs)
+    return after - before
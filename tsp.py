@@ -1,10 +1,550 @@
 import collections
+import functools
+import heapq
+import itertools
+import math
+import os
+import random
+import re
+import time
+import numpy as np
+
+# --- Distance-Matrix Backend ---
+# A dense NumPy matrix of travel costs with a name <-> index map. On complete
+# graphs each nearest-neighbor step becomes one masked argmin over a matrix row
+# instead of a Python scan over a neighbor dict. Missing edges are infinite.
+
+# Dict graphs at least this big and this dense are converted automatically.
+DENSE_MIN_CITIES = 64
+DENSE_MIN_FILL = 0.5
+
+class DistanceMatrix:
+    def __init__(self, names, matrix, integral=None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        if self.matrix.shape != (len(self.names), len(self.names)):
+            raise ValueError("Distance matrix must be square with one row per city.")
+        if integral is None:
+            finite = self.matrix[np.isfinite(self.matrix)]
+            integral = bool(np.all(finite == np.round(finite)))
+        # Integer costs stay integers in the totals reported to the user.
+        self.integral = integral
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds the matrix from a graph[city1][city2] = cost dictionary."""
+        # Each city gets the next index the first time it is looked up, keys first,
+        # so the whole graph is flattened with C-level iteration.
+        index = collections.defaultdict(itertools.count().__next__)
+        rows = np.repeat(np.fromiter(map(index.__getitem__, graph), np.intp, len(graph)),
+                         np.fromiter(map(len, graph.values()), np.intp, len(graph)))
+        columns = np.fromiter(map(index.__getitem__, itertools.chain.from_iterable(graph.values())),
+                              np.intp, len(rows))
+        costs = np.fromiter(itertools.chain.from_iterable(map(dict.values, graph.values())),
+                            np.float64, len(rows))
+        names = list(index)
+        matrix = np.full((len(names), len(names)), np.inf)
+        matrix[rows, columns] = costs
+        return cls(names, matrix)
+
+    def to_graph(self):
+        """Converts back to a defaultdict(dict) graph, skipping missing edges."""
+        graph = collections.defaultdict(dict)
+        for i, name in enumerate(self.names):
+            row = self.matrix[i]
+            for j in np.flatnonzero(np.isfinite(row)).tolist():
+                graph[name][self.names[j]] = self.cost_value(row[j])
+        return graph
+
+    def cost_value(self, cost):
+        """Converts a cost from the matrix to int when all costs are integers."""
+        return int(cost) if self.integral else float(cost)
+
+    def __len__(self):
+        return len(self.names)
+
+    def distance(self, i, j):
+        """Cost between city indices i and j as a Python float."""
+        return self.matrix.item(i, j)
+
+    def neighbor_lists(self, k):
+        """The k closest other cities of every city, nearest first."""
+        n = len(self.names)
+        k = min(k, n - 1)
+        if k <= 0:
+            return [[] for _ in range(n)]
+        lists = []
+        # Row blocks keep the temporary arrays small on big matrices.
+        for start in range(0, n, 1024):
+            block = self.matrix[start:start + 1024].copy()
+            block[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1, kind="stable")
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            lengths = np.isfinite(np.take_along_axis(block, nearest, axis=1)).sum(axis=1)
+            lists.extend(row[:length] for row, length in zip(nearest.tolist(), lengths.tolist()))
+        return lists
+
+class _GraphDistances:
+    """Index-based view of a graph[city1][city2] = cost dictionary."""
+
+    def __init__(self, graph):
+        index = collections.defaultdict(itertools.count().__next__)
+        for _ in map(index.__getitem__, itertools.chain(graph, itertools.chain.from_iterable(graph.values()))):
+            pass
+        self.names = list(index)
+        self.index = dict(index)
+        self.rows = [graph.get(name, {}) for name in self.names]
+        costs = itertools.chain.from_iterable(map(dict.values, graph.values()))
+        self.integral = all(float(cost).is_integer() for cost in costs)
+
+    def __len__(self):
+        return len(self.names)
+
+    def distance(self, i, j):
+        return self.rows[i].get(self.names[j], float('inf'))
+
+    def neighbor_lists(self, k):
+        index = self.index
+        return [[index[name] for name in heapq.nsmallest(k, row, key=row.__getitem__)]
+                for row in self.rows]
+
+    def cost_value(self, cost):
+        return int(cost) if self.integral else cost
+
+def _distances(graph):
+    """Index-based distances for a dict graph, DistanceMatrix or coordinate instance."""
+    return graph if isinstance(graph, (DistanceMatrix, EuclideanInstance)) else _GraphDistances(graph)
+
+def is_dense_graph(graph):
+    """True if a dict graph is large and close enough to complete to use a matrix."""
+    n = len(graph)
+    if n < DENSE_MIN_CITIES:
+        return False
+    edges = sum(len(neighbors) for neighbors in graph.values())
+    return edges >= DENSE_MIN_FILL * n * (n - 1)
+
+def _nearest_neighbor_matrix(dm, start_node, verbose=True):
+    """Nearest-neighbor tour over a DistanceMatrix, one masked argmin per step."""
+    if start_node not in dm.index:
+        if verbose:
+            print(f"Error: Starting city '{start_node}' not found in the graph.")
+        return None, 0
+
+    matrix = dm.matrix
+    start = dm.index[start_node]
+    # blocked[j] is +inf once city j is visited, so row + blocked masks it out.
+    blocked = np.zeros(len(dm))
+    blocked[start] = np.inf
+    tour = [start]
+    total_cost = 0.0
+    current = start
+    for _ in range(len(dm) - 1):
+        row = matrix[current] + blocked
+        nearest = int(row.argmin())
+        if row[nearest] == np.inf:
+            if verbose:
+                print(f"Error: Stuck at '{dm.names[current]}'. Cannot reach any unvisited city.")
+            return None, 0
+        total_cost += matrix[current, nearest]
+        blocked[nearest] = np.inf
+        tour.append(nearest)
+        current = nearest
+
+    return_cost = matrix[current, start]
+    if not np.isfinite(return_cost):
+        if verbose:
+            print(f"Error: No return path from '{dm.names[current]}' back to '{start_node}'.")
+        return None, 0
+    tour.append(start)
+    return [dm.names[i] for i in tour], dm.cost_value(total_cost + return_cost)
+
+# --- Euclidean Coordinate Instances ---
+# Cities given as points on a map. Distances are computed when asked for, so
+# memory stays O(n); nearest-city queries go through a bucket grid instead of
+# a distance matrix.
+
+# Constants of the TSPLIB GEO metric, kept as the reference code has them.
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+class _GridIndex:
+    """
+    Uniform bucket grid over a set of points with removal. Queries scan rings
+    of cells around the query point and stop once no unscanned cell can hold
+    anything closer. When most points are gone the grid is rebuilt coarser,
+    so queries stay cheap until the last point.
+    """
+
+    def __init__(self, xs, ys, points=None):
+        self.xs, self.ys = xs, ys
+        self._build(range(len(xs)) if points is None else points)
+
+    def _build(self, points):
+        points = list(points)
+        self.size = len(points)
+        xs, ys = self.xs, self.ys
+        if points:
+            min_x, max_x = min(xs[p] for p in points), max(xs[p] for p in points)
+            min_y, max_y = min(ys[p] for p in points), max(ys[p] for p in points)
+        else:
+            min_x = max_x = min_y = max_y = 0.0
+        width, height = max_x - min_x, max_y - min_y
+        # About two points per cell; the second bound keeps the cell count
+        # down when the points are (nearly) on a line.
+        count = max(len(points), 1)
+        cell = max(math.sqrt(width * height * 2 / count), max(width, height) * 2 / count, 1e-9)
+        self.cell, self.min_x, self.min_y = cell, min_x, min_y
+        self.nx = int(width / cell) + 1
+        self.ny = int(height / cell) + 1
+        self.buckets = [[] for _ in range(self.nx * self.ny)]
+        self.where = {}
+        for p in points:
+            bucket = self.buckets[self._cell_of(xs[p], ys[p])]
+            self.where[p] = len(bucket)
+            bucket.append(p)
+
+    def _cell_of(self, x, y):
+        cx = min(max(int((x - self.min_x) / self.cell), 0), self.nx - 1)
+        cy = min(max(int((y - self.min_y) / self.cell), 0), self.ny - 1)
+        return cx * self.ny + cy
+
+    def remove(self, p):
+        bucket = self.buckets[self._cell_of(self.xs[p], self.ys[p])]
+        slot = self.where.pop(p)
+        last = bucket.pop()
+        if last != p:
+            bucket[slot] = last
+            self.where[last] = slot
+        self.size -= 1
+        if 0 < self.size * 8 < len(self.buckets):
+            self._build(self.where)
+
+    def nearest(self, x, y, k=1):
+        """The k remaining points closest to (x, y), nearest first."""
+        if not self.size:
+            return []
+        cell, ny, buckets, xs, ys = self.cell, self.ny, self.buckets, self.xs, self.ys
+        cx = min(max(int((x - self.min_x) / cell), 0), self.nx - 1)
+        cy = min(max(int((y - self.min_y) / cell), 0), self.ny - 1)
+        # Distance from (x, y) to the border of its own cell, so ring r only
+        # holds points at least this far plus (r - 1) cells away.
+        inner = min(x - (self.min_x + cx * cell), self.min_x + (cx + 1) * cell - x,
+                    y - (self.min_y + cy * cell), self.min_y + (cy + 1) * cell - y)
+        inner = max(inner, 0.0)
+        found = []  # max-heap of (-squared distance, point) with up to k entries
+        max_ring = max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+        for r in range(max_ring + 1):
+            if len(found) == k:
+                reach = inner + (r - 1) * cell
+                if r > 0 and reach > 0 and reach * reach >= -found[0][0]:
+                    break
+            x0, x1, y0, y1 = cx - r, cx + r, cy - r, cy + r
+            for gx in range(max(x0, 0), min(x1, self.nx - 1) + 1):
+                edge = gx == x0 or gx == x1
+                for gy in (range(max(y0, 0), min(y1, ny - 1) + 1) if edge else
+                           [g for g in (y0, y1) if 0 <= g < ny]):
+                    for p in buckets[gx * ny + gy]:
+                        dx, dy = xs[p] - x, ys[p] - y
+                        d2 = dx * dx + dy * dy
+                        if len(found) < k:
+                            heapq.heappush(found, (-d2, p))
+                        elif d2 < -found[0][0]:
+                            heapq.heapreplace(found, (-d2, p))
+        return [p for _, p in sorted(found, reverse=True)]
+
+class EuclideanInstance:
+    """
+    A TSP instance of named points; the cost between two cities is computed
+    on demand from their coordinates. With metric=None it is the plain
+    straight-line distance. The TSPLIB metrics 'EUC_2D', 'CEIL_2D', 'ATT'
+    (rounded to integers) and 'GEO' (great-circle kilometres, coordinates
+    in DDD.MM degrees) are also supported. Up to cache_size recent
+    distances are cached.
+    """
+
+    METRICS = (None, "EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+    def __init__(self, names, xs, ys, metric=None, cache_size=1 << 16):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown distance metric '{metric}'.")
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.xs = [float(x) for x in xs]
+        self.ys = [float(y) for y in ys]
+        if not len(self.names) == len(self.xs) == len(self.ys):
+            raise ValueError("Need one x and one y coordinate per city.")
+        self.metric = metric
+        self._coordinate_arrays = None
+        # Every metric except GEO grows with the straight-line distance, so
+        # the bucket grid finds nearest cities for them.
+        self.planar = metric != "GEO"
+        if metric == "GEO":
+            self.latitudes = [_geo_radians(x) for x in self.xs]
+            self.longitudes = [_geo_radians(y) for y in self.ys]
+        distance = getattr(self, "_" + (metric or "exact").lower())
+        self.distance = functools.lru_cache(maxsize=cache_size)(distance) if cache_size else distance
+
+    def __len__(self):
+        return len(self.names)
+
+    def _exact(self, i, j):
+        return math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j])
+
+    def _euc_2d(self, i, j):
+        return int(math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j]) + 0.5)
+
+    def _ceil_2d(self, i, j):
+        return math.ceil(math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j]))
+
+    def _att(self, i, j):
+        dx, dy = self.xs[i] - self.xs[j], self.ys[i] - self.ys[j]
+        r = math.sqrt((dx * dx + dy * dy) / 10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+
+    def _geo(self, i, j):
+        lat, lon = self.latitudes, self.longitudes
+        q1 = math.cos(lon[i] - lon[j])
+        q2 = math.cos(lat[i] - lat[j])
+        q3 = math.cos(lat[i] + lat[j])
+        cosine = min(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), 1.0)
+        return int(GEO_RADIUS * math.acos(cosine) + 1.0)
+
+    def _arrays(self):
+        """Coordinates (radians for GEO) as NumPy arrays, built on first use."""
+        if self._coordinate_arrays is None:
+            if self.metric == "GEO":
+                self._coordinate_arrays = (np.asarray(self.latitudes), np.asarray(self.longitudes))
+            else:
+                self._coordinate_arrays = (np.asarray(self.xs), np.asarray(self.ys))
+        return self._coordinate_arrays
+
+    def pair_distances(self, i, j):
+        """Costs between cities i and j for index arrays of any (broadcastable) shape."""
+        first, second = self._arrays()
+        if self.metric == "GEO":
+            q1 = np.cos(second[i] - second[j])
+            q2 = np.cos(first[i] - first[j])
+            q3 = np.cos(first[i] + first[j])
+            cosine = np.minimum(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), 1.0)
+            return np.floor(GEO_RADIUS * np.arccos(cosine) + 1.0)
+        dx = first[j] - first[i]
+        dy = second[j] - second[i]
+        if self.metric == "ATT":
+            r = np.sqrt((dx * dx + dy * dy) / 10.0)
+            t = np.floor(r + 0.5)
+            return np.where(t < r, t + 1, t)
+        r = np.hypot(dx, dy)
+        if self.metric == "EUC_2D":
+            return np.floor(r + 0.5)
+        if self.metric == "CEIL_2D":
+            return np.ceil(r)
+        return r
+
+    def distances_from(self, i):
+        """Costs from city i to every city as a NumPy array, in one vectorized pass."""
+        return self.pair_distances(i, np.arange(len(self.names)))
+
+    def cost_value(self, cost):
+        return float(cost) if self.metric is None else int(cost)
+
+    def neighbor_lists(self, k):
+        """The k closest other cities of every city, nearest first."""
+        n = len(self.names)
+        if not self.planar:
+            k = min(k, n - 1)
+            lists = []
+            for i in range(n):
+                row = self.distances_from(i)
+                row[i] = np.inf
+                nearest = np.argpartition(row, k - 1)[:k] if k > 0 else np.arange(0)
+                lists.append(nearest[np.argsort(row[nearest], kind="stable")].tolist())
+            return lists
+        grid = _GridIndex(self.xs, self.ys)
+        return [grid.nearest(self.xs[i], self.ys[i], k + 1)[1:] if grid.size > 1 else []
+                for i in range(n)]
+
+def _geo_radians(value):
+    """A TSPLIB GEO coordinate in DDD.MM format (degrees and minutes) in radians."""
+    degrees = int(value)
+    minutes = value - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+def _nearest_neighbor_points(instance, start_node):
+    """
+    Nearest-neighbor tour over a coordinate instance. Planar metrics use the
+    bucket grid; GEO instances take a masked argmin over each city's row.
+    """
+    if start_node not in instance.index:
+        print(f"Error: Starting city '{start_node}' not found in the graph.")
+        return None, 0
+    xs, ys = instance.xs, instance.ys
+    start = instance.index[start_node]
+    if instance.planar:
+        grid = _GridIndex(xs, ys)
+        grid.remove(start)
+        remaining = grid.size
+    else:
+        blocked = np.zeros(len(instance))
+        blocked[start] = np.inf
+        remaining = len(instance) - 1
+    tour = [start]
+    total_cost = 0
+    current = start
+    for _ in range(remaining):
+        if instance.planar:
+            nearest = grid.nearest(xs[current], ys[current])[0]
+            grid.remove(nearest)
+        else:
+            nearest = int((instance.distances_from(current) + blocked).argmin())
+            blocked[nearest] = np.inf
+        total_cost += instance.distance(current, nearest)
+        tour.append(nearest)
+        current = nearest
+    total_cost += instance.distance(current, start)
+    tour.append(start)
+    return [instance.names[i] for i in tour], instance.cost_value(total_cost)
+
+# --- TSPLIB Files ---
+# Standard benchmark instances. Coordinate files become an EuclideanInstance
+# with the file's metric and EXPLICIT files a DistanceMatrix; in both cases
+# the numeric sections are read in large chunks straight into arrays.
+
+# Any line starting with a letter ends a numeric section (next keyword or EOF).
+_TSPLIB_KEYWORD_LINE = re.compile(rb"^[ \t]*[A-Za-z]", re.MULTILINE)
+
+# EXPLICIT matrix layouts as (row-major triangle, includes diagonal). A
+# column-wise triangle lists the same numbers as the opposite row-wise one.
+_TSPLIB_TRIANGLES = {
+    "UPPER_ROW": ("upper", False), "LOWER_COL": ("upper", False),
+    "LOWER_ROW": ("lower", False), "UPPER_COL": ("lower", False),
+    "UPPER_DIAG_ROW": ("upper", True), "LOWER_DIAG_COL": ("upper", True),
+    "LOWER_DIAG_ROW": ("lower", True), "UPPER_DIAG_COL": ("lower", True),
+}
+
+def _read_tsplib_numbers(f, path, chunk_size):
+    """
+    Reads the numbers of one section into a float array, leaving f at the
+    first line after it.
+    """
+    pieces = []
+    carry = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if chunk:
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1
+            data, carry = data[:cut], data[cut:]
+        else:
+            data, carry = carry, b""
+        match = _TSPLIB_KEYWORD_LINE.search(data)
+        if match:
+            # Hand the rest back to the header reader.
+            f.seek(match.start() - len(data) - len(carry), os.SEEK_CUR)
+            data = data[:match.start()]
+        try:
+            pieces.append(np.array(data.split(), dtype=np.float64))
+        except ValueError:
+            raise ValueError(f"Malformed section data in {path}") from None
+        if match or not chunk:
+            return np.concatenate(pieces)
+
+def _tsplib_matrix(weights, n, layout):
+    """Full symmetric matrix from the numbers of an EDGE_WEIGHT_SECTION."""
+    if layout == "FULL_MATRIX":
+        if len(weights) != n * n:
+            raise ValueError(f"Expected {n * n} edge weights, found {len(weights)}.")
+        matrix = weights.reshape(n, n).copy()
+        if not np.array_equal(matrix, matrix.T):
+            raise ValueError("FULL_MATRIX edge weights are not symmetric.")
+    elif layout in _TSPLIB_TRIANGLES:
+        side, diagonal = _TSPLIB_TRIANGLES[layout]
+        offset = 0 if diagonal else 1
+        rows, columns = np.triu_indices(n, offset) if side == "upper" else np.tril_indices(n, -offset)
+        if len(weights) != len(rows):
+            raise ValueError(f"Expected {len(rows)} edge weights, found {len(weights)}.")
+        matrix = np.zeros((n, n))
+        matrix[rows, columns] = weights
+        matrix[columns, rows] = weights
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT '{layout}'.")
+    # No self-loops, as in a DistanceMatrix built from a graph.
+    np.fill_diagonal(matrix, np.inf)
+    return matrix
+
+def load_tsplib(path, cache_size=1 << 16, chunk_size=1 << 22):
+    """
+    Reads a symmetric TSPLIB .tsp file (TYPE: TSP) with EDGE_WEIGHT_TYPE
+    EUC_2D, CEIL_2D, ATT, GEO or EXPLICIT. Cities are named by their node
+    numbers as strings. Returns an EuclideanInstance (distances computed
+    lazily and cached) or, for EXPLICIT files, a DistanceMatrix. Raises
+    ValueError on a malformed or unsupported file, including ATSP files.
+    """
+    header, sections = {}, {}
+    with open(path, "rb") as f:
+        line = f.readline()
+        while line:
+            text = line.decode(errors="replace").strip()
+            key, _, value = text.partition(":")
+            key = key.strip().upper()
+            if key == "EOF":
+                break
+            if key.endswith("_SECTION"):
+                sections[key] = _read_tsplib_numbers(f, path, chunk_size)
+            elif key:
+                header[key] = value.strip()
+            line = f.readline()
+
+    # Only symmetric problems: the tour improvement and exact solvers assume it.
+    # An empty TYPE line counts as missing.
+    if (header.get("TYPE") or "TSP").split()[0] != "TSP":
+        raise ValueError(f"Unsupported problem TYPE '{header['TYPE']}' in {path}")
+    try:
+        n = int(header["DIMENSION"])
+    except (KeyError, ValueError):
+        raise ValueError(f"Missing or bad DIMENSION in {path}") from None
+    metric = header.get("EDGE_WEIGHT_TYPE", "").upper()
+
+    if metric == "EXPLICIT":
+        if "EDGE_WEIGHT_SECTION" not in sections:
+            raise ValueError(f"No EDGE_WEIGHT_SECTION in {path}")
+        layout = (header.get("EDGE_WEIGHT_FORMAT") or "FULL_MATRIX").upper()
+        matrix = _tsplib_matrix(sections["EDGE_WEIGHT_SECTION"], n, layout)
+        return DistanceMatrix([str(i) for i in range(1, n + 1)], matrix)
+
+    if metric not in ("EUC_2D", "CEIL_2D", "ATT", "GEO"):
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE '{metric}' in {path}")
+    if "NODE_COORD_SECTION" not in sections:
+        raise ValueError(f"No NODE_COORD_SECTION in {path}")
+    coords = sections["NODE_COORD_SECTION"]
+    if len(coords) != 3 * n:
+        raise ValueError(f"Expected {n} lines of 'node x y' in {path}, found {len(coords) / 3:g}.")
+    coords = coords.reshape(n, 3)
+    names = [str(node) for node in coords[:, 0].astype(np.int64).tolist()]
+    return EuclideanInstance(names, coords[:, 1].tolist(), coords[:, 2].tolist(),
+                             metric=metric, cache_size=cache_size)
+
+# --- Nearest Neighbor Solver ---
 
 def solve_tsp_nearest_neighbor(graph, start_node):
     """
     Finds a TSP tour using the greedy "Nearest Neighbor" method.
     At each step, it travels to the closest unvisited city.
+    The graph may be a graph[city1][city2] = cost dictionary, a
+    DistanceMatrix or an EuclideanInstance (see also load_tsplib). Large,
+    nearly complete dictionaries are converted to a matrix first; on ties
+    between equally close cities the matrix path picks the city that comes
+    first in the matrix.
     """
+    if isinstance(graph, DistanceMatrix):
+        return _nearest_neighbor_matrix(graph, start_node)
+    if isinstance(graph, EuclideanInstance):
+        return _nearest_neighbor_points(graph, start_node)
+    if is_dense_graph(graph):
+        return _nearest_neighbor_matrix(DistanceMatrix.from_graph(graph), start_node)
+
     # --- 1. Initialization ---
     # Create a set of all unique cities to know how many we need to visit.
     all_cities = set(graph.keys())
@@ -64,21 +604,622 @@ def solve_tsp_nearest_neighbor(graph, start_node):
     # Return the completed tour and its total cost.
     return tour, total_cost
 
+# --- Multi-Start Nearest Neighbor ---
+# The best start city for nearest neighbor differs a lot between instances,
+# so tours are built from many start cities across a process pool and only
+# the cheapest is kept. The distances (the matrix, or the coordinates of a
+# coordinate instance) go to the workers once, through shared memory.
+
+# Distances and "a tour is done" flag of a multi-start worker; set per process
+# by _init_multistart_tours.
+_multistart_shared = None
+
+def _init_multistart_tours(block_name, kind, size, options, done_flag):
+    global _multistart_shared
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=block_name)
+    if kind == "matrix":
+        # The matrix is read in place, so the block stays open in the worker.
+        matrix = np.ndarray((size, size), dtype=np.float64, buffer=block.buf)
+        dist = DistanceMatrix(range(size), matrix, **options)
+    else:
+        coords = np.ndarray((2, size), dtype=np.float64, buffer=block.buf)
+        dist = EuclideanInstance(range(size), coords[0].tolist(), coords[1].tolist(), **options)
+        del coords
+        block.close()
+        block = None
+    _multistart_shared = (dist, block, done_flag)
+
+def _multistart_tours_worker(starts, deadline):
+    """
+    Nearest-neighbor tours from a batch of (order, start index) pairs.
+    Returns the number of tours built and (cost, order, tour) of the cheapest.
+    """
+    dist, _, done_flag = _multistart_shared
+    best = None
+    built = 0
+    for order, start in starts:
+        # Past the deadline, only start a tour if no worker has finished one.
+        if time.time() >= deadline and done_flag.value:
+            break
+        if isinstance(dist, DistanceMatrix):
+            tour, cost = _nearest_neighbor_matrix(dist, start, verbose=False)
+        else:
+            tour, cost = _nearest_neighbor_points(dist, start)
+        built += 1
+        if tour is not None:
+            done_flag.value = 1
+            if best is None or (cost, order) < best[:2]:
+                best = (cost, order, tour)
+    return built, best
+
+def multistart_nearest_neighbor(graph, starts=None, processes=None, time_limit=None,
+                                seed=None, stats=None):
+    """
+    Builds nearest-neighbor tours from many start cities across a process
+    pool and returns the cheapest as (tour, cost); the tour begins and ends
+    at its own start city. starts is None for every city, a number of start
+    cities to sample at random (reproducible with seed), or a list of
+    cities. Dict graphs are converted to a DistanceMatrix. After time_limit
+    seconds no new tour is started once any tour is complete, so the call
+    takes about time_limit plus one tour. stats, if given, receives 'tours'
+    (number built), 'best_start' and 'seconds'.
+    """
+    import concurrent.futures
+    import multiprocessing
+    from multiprocessing import shared_memory
+    start_time = time.perf_counter()
+    if not isinstance(graph, (DistanceMatrix, EuclideanInstance)):
+        graph = DistanceMatrix.from_graph(graph)
+    n = len(graph)
+    if starts is None:
+        start_cities = list(range(n))
+    elif isinstance(starts, int):
+        start_cities = random.Random(seed).sample(range(n), min(starts, n))
+    else:
+        unknown = [city for city in starts if city not in graph.index]
+        if unknown:
+            raise ValueError(f"Starting city '{unknown[0]}' not found in the graph.")
+        start_cities = [graph.index[city] for city in starts]
+    processes = processes or os.cpu_count() or 1
+    deadline = time.time() + time_limit if time_limit is not None else math.inf
+
+    if isinstance(graph, DistanceMatrix):
+        kind, options, data = "matrix", {"integral": graph.integral}, graph.matrix
+    else:
+        kind, options, data = "points", {"metric": graph.metric}, np.array([graph.xs, graph.ys])
+    block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    np.ndarray(data.shape, dtype=np.float64, buffer=block.buf)[:] = data
+    done_flag = multiprocessing.Value("b", 0)
+    # A few batches per process balance the load; striding spreads each
+    # batch over the whole list of starts.
+    ordered = list(enumerate(start_cities))
+    num_batches = max(min(len(ordered), processes * 4), 1)
+    best, tours = None, 0
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_multistart_tours,
+                initargs=(block.name, kind, n, options, done_flag)) as pool:
+            running = [pool.submit(_multistart_tours_worker, ordered[k::num_batches], deadline)
+                       for k in range(num_batches)]
+            for future in concurrent.futures.as_completed(running):
+                built, result = future.result()
+                tours += built
+                if result is not None and (best is None or result[:2] < best[:2]):
+                    best = result
+    finally:
+        block.close()
+        block.unlink()
+
+    if stats is not None:
+        stats["tours"] = tours
+        stats["best_start"] = graph.names[best[2][0]] if best else None
+        stats["seconds"] = time.perf_counter() - start_time
+    if best is None:
+        print("Error: No start city gives a complete tour.")
+        return None, 0
+    cost, _, tour = best
+    return [graph.names[i] for i in tour], cost
+
+# --- Tour Improvement (2-opt / Or-opt) ---
+# The tour is an array of city indices plus a position index, so the
+# neighbors of a city in the tour are found in O(1). Candidate moves only
+# connect a city to one of its k nearest neighbors, and a queue of "active"
+# cities plays the role of don't-look bits: a city is only re-examined after
+# one of its tour edges changed. Costs are assumed symmetric.
+
+def _reverse(tour, pos, i, j):
+    """Reverses the tour between positions i and j (inclusive, wrapping around)."""
+    n = len(tour)
+    if i <= j:
+        segment = tour[i:j + 1]
+        segment.reverse()
+        tour[i:j + 1] = segment
+        positions = range(i, j + 1)
+    else:
+        segment = tour[i:] + tour[:j + 1]
+        segment.reverse()
+        tour[i:] = segment[:n - i]
+        tour[:j + 1] = segment[n - i:]
+        positions = itertools.chain(range(i, n), range(j + 1))
+    for city, k in zip(segment, positions):
+        pos[city] = k
+
+def _two_opt_move(tour, pos, i, j):
+    """
+    Reverses positions i..j, or the rest of the tour if that is shorter;
+    both give the same cycle.
+    """
+    n = len(tour)
+    if (j - i) % n + 1 > n // 2:
+        i, j = (j + 1) % n, (i - 1) % n
+    _reverse(tour, pos, i, j)
+
+def _move_segment(tour, pos, i, length, c, e, first_next_to_c):
+    """
+    Moves the segment of `length` cities starting at position i between the
+    adjacent cities c and e, built from reversals of the stretch it passes.
+    first_next_to_c says whether the segment's first city ends up beside c.
+    """
+    n = len(tour)
+    first = tour[i]
+    x, y = (c, e) if tour[(pos[c] + 1) % n] == e else (e, c)
+    forward = (pos[x] - (i + length)) % n + 1
+    backward = (i - pos[y]) % n
+    if forward <= backward:
+        # p S Y y -> p Y S^r y: reverse S+Y, then put Y back in order
+        _reverse(tour, pos, i, pos[x])
+        _reverse(tour, pos, i, (i + forward - 1) % n)
+        seg_start = (i + forward) % n
+    else:
+        # x Y S nx -> x S^r Y nx
+        y_start = pos[y]
+        _reverse(tour, pos, y_start, (i + length - 1) % n)
+        _reverse(tour, pos, (y_start + length) % n, (i + length - 1) % n)
+        seg_start = y_start
+    # The segment is now reversed, with its last city beside x.
+    first_next_to_x = first_next_to_c if x == c else not first_next_to_c
+    if first_next_to_x:
+        _reverse(tour, pos, seg_start, (seg_start + length - 1) % n)
+
+def improve_tour(graph, tour, time_limit=5.0, neighbors=8, stats=None):
+    """
+    Improves any tour with 2-opt and Or-opt moves until no candidate move
+    helps or time_limit seconds have passed. graph is a dict graph or a
+    DistanceMatrix; tour is a list of cities, open or closed (first city
+    repeated at the end). Returns (tour, cost) in the same format as the
+    solvers: a closed tour starting at the same city, and its total cost.
+    """
+    dist = _distances(graph)
+    cities = list(tour[:-1]) if len(tour) > 1 and tour[0] == tour[-1] else list(tour)
+    if len(set(cities)) != len(cities):
+        raise ValueError("Tour visits a city more than once.")
+    t = [dist.index[city] for city in cities]
+    n = len(t)
+    start_time = time.perf_counter()
+    deadline = start_time + time_limit
+    d = dist.distance
+    pos = [-1] * len(dist)
+    for i, city in enumerate(t):
+        pos[city] = i
+    candidates = dist.neighbor_lists(neighbors) if n > 3 else [[] for _ in range(len(dist))]
+
+    active = collections.deque(t)
+    queued = [False] * len(dist)
+    for city in t:
+        queued[city] = True
+
+    def wake(*cities):
+        for city in cities:
+            if not queued[city]:
+                queued[city] = True
+                active.append(city)
+
+    two_opt = or_opt = checks = 0
+    while active:
+        checks += 1
+        if checks & 255 == 0 and time.perf_counter() >= deadline:
+            break
+        a = active.popleft()
+        queued[a] = False
+        improved = False
+
+        # 2-opt with a's successor: replace (a, b) and (c, e) by (a, c) and (b, e)
+        i = pos[a]
+        b = t[i + 1 if i + 1 < n else 0]
+        d_ab = d(a, b)
+        for c in candidates[a]:
+            d_ac = d(a, c)
+            if d_ac >= d_ab:
+                break
+            j = pos[c]
+            if j < 0:
+                continue
+            e = t[j + 1 if j + 1 < n else 0]
+            if c == b or e == a:
+                continue
+            if d_ab + d(c, e) - d_ac - d(b, e) > 1e-9:
+                _two_opt_move(t, pos, pos[b], j)
+                wake(a, b, c, e)
+                two_opt += 1
+                improved = True
+                break
+        if improved:
+            continue
+
+        # 2-opt with a's predecessor: replace (b, a) and (e, c) by (c, a) and (e, b)
+        b = t[i - 1]
+        d_ab = d(b, a)
+        for c in candidates[a]:
+            d_ac = d(a, c)
+            if d_ac >= d_ab:
+                break
+            j = pos[c]
+            if j < 0:
+                continue
+            e = t[j - 1]
+            if c == b or e == a:
+                continue
+            if d_ab + d(e, c) - d_ac - d(e, b) > 1e-9:
+                _two_opt_move(t, pos, j, pos[b])
+                wake(a, b, c, e)
+                two_opt += 1
+                improved = True
+                break
+        if improved:
+            continue
+
+        # Or-opt: move the segment of 1-3 cities starting at a next to a near city
+        for length in (1, 2, 3):
+            if length > n - 3:
+                break
+            i = pos[a]
+            last = t[(i + length - 1) % n]
+            p = t[i - 1]
+            nx = t[(i + length) % n]
+            removal_gain = d(p, a) + d(last, nx) - d(p, nx)
+            segment = {t[(i + k) % n] for k in range(length)}
+            best = None
+            for end in (a, last):
+                for c in candidates[end]:
+                    if d(end, c) >= removal_gain:
+                        break
+                    if pos[c] < 0 or c in segment:
+                        continue
+                    for e in (t[(pos[c] + 1) % n], t[pos[c] - 1]):
+                        if e in segment:
+                            continue
+                        # Insert between c and e with `end` next to c
+                        other = last if end == a else a
+                        gain = removal_gain - (d(c, end) + d(other, e) - d(c, e))
+                        if gain > 1e-9 and (best is None or gain > best[0]):
+                            best = (gain, c, e, end)
+            if best is None:
+                continue
+            _, c, e, end = best
+            _move_segment(t, pos, i, length, c, e, end == a)
+            wake(p, nx, a, last, c, e)
+            or_opt += 1
+            improved = True
+            break
+
+    total = sum(d(t[k], t[k + 1 if k + 1 < n else 0]) for k in range(n)) if n > 1 else 0
+    start = pos[dist.index[cities[0]]] if n else 0
+    ordered = t[start:] + t[:start]
+    if stats is not None:
+        stats.update(two_opt=two_opt, or_opt=or_opt, checks=checks,
+                     seconds=time.perf_counter() - start_time)
+    names = dist.names
+    return [names[city] for city in ordered] + [names[ordered[0]]] if n else [], dist.cost_value(total)
+
+# --- Exact Solvers ---
+# Held-Karp for small instances and branch-and-bound for somewhat larger ones,
+# mainly to measure how far the heuristic tours are from optimal.
+
+HELD_KARP_MAX_CITIES = 20
+
+def _dense_costs(graph, start_node):
+    """(dist, matrix, start index) with a dense cost matrix for an exact solver."""
+    dist = _distances(graph)
+    if start_node is None:
+        start_node = dist.names[0] if len(dist) else None
+    if start_node not in dist.index:
+        raise ValueError(f"Starting city '{start_node}' not found in the graph.")
+    if isinstance(dist, DistanceMatrix):
+        matrix = dist.matrix.copy()
+    else:
+        n = len(dist)
+        matrix = np.array([[dist.distance(i, j) if i != j else np.inf for j in range(n)]
+                           for i in range(n)], dtype=np.float64).reshape(n, n)
+    return dist, matrix, dist.index[start_node]
+
+def optimality_gap(cost, lower_bound):
+    """Relative gap between a tour cost and a lower bound on the optimum."""
+    return (cost - lower_bound) / cost if cost else 0.0
+
+def held_karp(graph, start_node=None, max_cities=HELD_KARP_MAX_CITIES, stats=None):
+    """
+    Exact TSP by dynamic programming over subsets. best[mask, j] is the
+    cheapest path from the start through the cities in mask ending at j.
+    All masks with the same number of cities form a layer, and a layer is
+    filled for one end city at a time with a single NumPy min over the
+    previous layer. Needs O(2^n * n) memory, so n is capped at max_cities.
+    Returns (tour, cost) like the heuristics, or (None, 0) if there is no
+    tour. stats, if given, receives 'nodes' (subproblems solved), 'gap'
+    and 'seconds'.
+    """
+    start_time = time.perf_counter()
+    dist, matrix, start = _dense_costs(graph, start_node)
+    n = len(dist)
+    if n > max_cities:
+        raise ValueError(f"Held-Karp is limited to {max_cities} cities; this graph has {n}.")
+    if n <= 1:
+        if stats is not None:
+            stats.update(nodes=0, gap=0.0, seconds=time.perf_counter() - start_time)
+        return [dist.names[start]] * (n + 1), dist.cost_value(0)
+
+    others = np.array([c for c in range(n) if c != start])
+    m = n - 1
+    inner = matrix[np.ix_(others, others)]
+    best = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int8)
+    bits = 1 << np.arange(m)
+    best[bits, np.arange(m)] = matrix[start, others]
+
+    masks = np.arange(1 << m, dtype=np.int64)
+    sizes = np.zeros(1 << m, dtype=np.int8)
+    for b in range(m):
+        sizes += (masks >> b) & 1
+    nodes = m
+    for size in range(2, m + 1):
+        layer = masks[sizes == size]
+        for j in range(m):
+            ending = layer[(layer & bits[j]) != 0]
+            previous = ending ^ bits[j]
+            candidates = best[previous] + inner[:, j]
+            choice = candidates.argmin(axis=1)
+            best[ending, j] = candidates[np.arange(len(ending)), choice]
+            parent[ending, j] = choice
+            nodes += len(ending)
+
+    full = (1 << m) - 1
+    closing = best[full] + matrix[others, start]
+    last = int(closing.argmin())
+    if not np.isfinite(closing[last]):
+        print("Error: No complete tour exists in this graph.")
+        return None, 0
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last)
+        mask, last = mask ^ (1 << last), int(parent[mask, last])
+    tour = [start] + [int(others[j]) for j in reversed(order)] + [start]
+    if stats is not None:
+        stats.update(nodes=nodes, gap=0.0, seconds=time.perf_counter() - start_time)
+    return [dist.names[c] for c in tour], dist.cost_value(closing.min())
+
+def _path_bound(matrix, last, start, remaining):
+    """
+    Lower bound for finishing a path at `last` through `remaining` and back
+    to `start`: the minimum spanning tree of the remaining cities plus the
+    cheapest edge into them from `last` and out of them to `start`.
+    """
+    if not len(remaining):
+        return matrix[last, start]
+    sub = matrix[np.ix_(remaining, remaining)]
+    # Prim's algorithm, one vectorized update per added city.
+    connect = sub[0].copy()
+    in_tree = np.zeros(len(remaining), dtype=bool)
+    in_tree[0] = True
+    connect[0] = np.inf
+    tree = 0.0
+    for _ in range(len(remaining) - 1):
+        k = int(connect.argmin())
+        tree += connect[k]
+        in_tree[k] = True
+        connect = np.minimum(connect, sub[k])
+        connect[in_tree] = np.inf
+    return tree + matrix[last, remaining].min() + matrix[remaining, start].min()
+
+def _one_tree_penalties(matrix, start, upper_bound, iterations=100):
+    """
+    Held-Karp 1-tree subgradient: node penalties pi that raise the 1-tree
+    bound (a spanning tree of the other cities plus the two cheapest edges at
+    the start). Costs d[i, j] + pi[i] + pi[j] change every tour by the same
+    2 * sum(pi), so any bound on the adjusted costs stays valid.
+    """
+    n = len(matrix)
+    pi = np.zeros(n)
+    best_pi, best_bound = pi.copy(), -np.inf
+    others = np.array([c for c in range(n) if c != start])
+    step_scale = 2.0
+    stale = 0
+    for _ in range(iterations):
+        adjusted = matrix + pi[:, None] + pi[None, :]
+        sub = adjusted[np.ix_(others, others)]
+        # Prim's algorithm on the other cities, tracking each city's tree parent.
+        connect = sub[0].copy()
+        parent = np.zeros(len(others), dtype=np.int64)
+        in_tree = np.zeros(len(others), dtype=bool)
+        in_tree[0] = True
+        connect[0] = np.inf
+        degree = np.zeros(n)
+        total = 0.0
+        for _ in range(len(others) - 1):
+            k = int(connect.argmin())
+            if not np.isfinite(connect[k]):
+                return best_pi, best_bound
+            total += connect[k]
+            degree[others[k]] += 1
+            degree[others[parent[k]]] += 1
+            in_tree[k] = True
+            closer = sub[k] < connect
+            parent[closer] = k
+            connect = np.where(closer, sub[k], connect)
+            connect[in_tree] = np.inf
+        ends = others[np.argsort(adjusted[start, others], kind="stable")[:2]]
+        total += adjusted[start, ends].sum()
+        degree[ends] += 1
+        degree[start] = 2
+        bound = total - 2 * pi.sum()
+        if bound > best_bound + 1e-9:
+            best_bound, best_pi, stale = bound, pi.copy(), 0
+        else:
+            stale += 1
+            if stale >= 5:
+                step_scale /= 2
+                stale = 0
+        deviation = degree - 2
+        norm = (deviation ** 2).sum()
+        if norm == 0 or not np.isfinite(upper_bound) or step_scale < 1e-4:
+            break
+        pi = pi + step_scale * (upper_bound - bound) / norm * deviation
+    return best_pi, best_bound
+
+def branch_and_bound(graph, start_node=None, time_limit=60.0, node_limit=None, stats=None):
+    """
+    Exact TSP by depth-first branch and bound. The incumbent starts as the
+    nearest-neighbor tour polished by improve_tour, children are tried
+    nearest city first, and a partial path is pruned when its cost plus the
+    spanning-tree bound from _path_bound cannot beat the incumbent. The bound
+    is computed on costs adjusted by 1-tree penalties found at the root,
+    which makes it much tighter.
+    If time_limit or node_limit stops the search, the best tour so far is
+    returned along with a proven lower bound. Returns (tour, cost); stats, if
+    given, receives 'nodes', 'lower_bound', 'root_bound', 'gap', 'optimal'
+    and 'seconds'.
+    The costs must be symmetric, since the spanning-tree bounds do not hold
+    otherwise; raises ValueError for asymmetric costs (use held_karp).
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_limit
+    dist, matrix, start = _dense_costs(graph, start_node)
+    n = len(dist)
+    if not np.allclose(matrix, matrix.T):
+        raise ValueError("branch_and_bound needs symmetric costs; use held_karp for asymmetric graphs.")
+    if n <= 1:
+        if stats is not None:
+            stats.update(nodes=0, root_bound=0.0, lower_bound=0.0, gap=0.0, optimal=True,
+                         seconds=time.perf_counter() - start_time)
+        return [dist.names[start]] * (n + 1), dist.cost_value(0)
+
+    incumbent_tour, incumbent = None, np.inf
+    if n > 1:
+        dm = DistanceMatrix(dist.names, matrix)
+        names_tour, _ = _nearest_neighbor_matrix(dm, dist.names[start], verbose=False)
+        if names_tour is not None:
+            names_tour, _ = improve_tour(dm, names_tour,
+                                         time_limit=min(1.0, time_limit / 10))
+            incumbent_tour = [dist.index[name] for name in names_tour]
+            incumbent = sum(matrix[a, b] for a, b in zip(incumbent_tour, incumbent_tour[1:]))
+
+    everyone = np.array([c for c in range(n) if c != start])
+    if n > 2:
+        pi, root_bound = _one_tree_penalties(matrix, start, incumbent)
+    else:
+        pi, root_bound = np.zeros(n), (incumbent if n == 2 else 0.0)
+    adjusted = matrix + pi[:, None] + pi[None, :]
+
+    def completion_bound(last, rest):
+        return _path_bound(adjusted, last, start, rest) - 2 * pi[rest].sum() - pi[last] - pi[start]
+
+    # Each stack entry: (bound, cost so far, path); the path starts at the start city.
+    stack = [(root_bound, 0.0, (start,))]
+    nodes = 0
+    stopped = False
+    while stack:
+        if (nodes & 63 == 0 and time.perf_counter() > deadline) or \
+                (node_limit is not None and nodes >= node_limit):
+            stopped = True
+            break
+        bound, cost, path = stack.pop()
+        if bound >= incumbent - 1e-9:
+            continue
+        nodes += 1
+        last = path[-1]
+        if len(path) == n:
+            total = cost + matrix[last, start]
+            if total < incumbent - 1e-9:
+                incumbent, incumbent_tour = total, list(path) + [start]
+            continue
+        visited = set(path)
+        remaining = np.array([c for c in everyone if c not in visited])
+        children = []
+        for city in remaining[np.argsort(matrix[last, remaining], kind="stable")]:
+            step = matrix[last, city]
+            if not np.isfinite(step):
+                continue
+            rest = remaining[remaining != city]
+            child_bound = cost + step + completion_bound(int(city), rest)
+            if child_bound < incumbent - 1e-9:
+                children.append((child_bound, cost + step, path + (int(city),)))
+        # Nearest city is popped first.
+        stack.extend(reversed(children))
+
+    lower = min([incumbent] + [entry[0] for entry in stack]) if stopped else incumbent
+    if stats is not None:
+        stats.update(nodes=nodes, root_bound=float(root_bound), lower_bound=float(lower),
+                     gap=optimality_gap(float(incumbent), float(lower)) if incumbent_tour else None,
+                     optimal=not stopped, seconds=time.perf_counter() - start_time)
+    if incumbent_tour is None:
+        print("Error: No complete tour exists in this graph.")
+        return None, 0
+    return [dist.names[c] for c in incumbent_tour], dist.cost_value(incumbent)
+
 # --- Main Program Execution ---
+
+def _path_text(tour, limit=40):
+    """The tour as 'A -> B -> C', with the middle left out on big instances."""
+    if len(tour) <= limit:
+        return ' -> '.join(tour)
+    half = limit // 2
+    return f"{' -> '.join(tour[:half])} -> ... ({len(tour) - limit} more) ... -> {' -> '.join(tour[-half:])}"
+
 if __name__ == "__main__":
     # Use a defaultdict of dictionaries to easily store the graph.
     # e.g., graph['A']['B'] = 10
     graph = collections.defaultdict(dict)
 
     print("--- TSP Solver using Nearest Neighbor ---")
-    try:
-        # Get the number of connections the user wants to define.
-        num_edges = int(input("Enter the number of connections (edges): "))
-    except ValueError:
-        print("Invalid number. Exiting.")
-        exit()
+    answer = input("Enter the number of connections (edges), 'xy' to enter city coordinates,\n"
+                   "or the path of a TSPLIB file: ").strip()
+    if answer.lower() == "xy":
+        # Cities as points on a map: distances are computed, not typed in.
+        try:
+            num_cities = int(input("Enter the number of cities: "))
+        except ValueError:
+            print("Invalid number. Exiting.")
+            exit()
+        print("Enter each city and its coordinates (e.g., 'A 3.5 7')")
+        names, xs, ys = [], [], []
+        for i in range(num_cities):
+            try:
+                name, x, y = input(f"City {i+1}: ").strip().split()
+                names.append(name)
+                xs.append(float(x))
+                ys.append(float(y))
+            except ValueError:
+                print("Invalid input. Format must be 'City X Y'.")
+        graph = EuclideanInstance(names, xs, ys)
+        num_edges = 0
+    elif os.path.isfile(answer):
+        # A TSPLIB benchmark file.
+        try:
+            graph = load_tsplib(answer)
+        except ValueError as error:
+            print(f"Could not read {answer}: {error}")
+            exit()
+        print(f"Loaded {len(graph)} cities from {answer}.")
+        num_edges = 0
+    else:
+        try:
+            # Get the number of connections the user wants to define.
+            num_edges = int(answer)
+        except ValueError:
+            print("Invalid number. Exiting.")
+            exit()
+        print("Enter each connection and its cost (e.g., 'A B 5')")
 
-    print("Enter each connection and its cost (e.g., 'A B 5')")
     # Loop to get the details for each connection.
     for i in range(num_edges):
         try:
@@ -102,9 +1243,34 @@ if __name__ == "__main__":
     # If the function returned a valid tour, print the details.
     if tour:
         print("\n✅ Greedy TSP Tour Found:")
-        # ' -> '.join(tour) creates a nice string like "A -> B -> C"
-        print(f"   Path: {' -> '.join(tour)}")
+        # _path_text(tour) creates a nice string like "A -> B -> C"
+        print(f"   Path: {_path_text(tour)}")
         print(f"   Total Cost: {cost}")
+
+        # Nearest neighbor from other start cities, within about two seconds.
+        stats = {}
+        best_tour, best_cost = multistart_nearest_neighbor(graph, time_limit=2.0, stats=stats)
+        if best_tour and best_cost < cost:
+            print(f"\n✅ Best of {stats['tours']} Start Cities (from '{stats['best_start']}'):")
+            print(f"   Path: {_path_text(best_tour)}")
+            print(f"   Total Cost: {best_cost}")
+        else:
+            best_tour, best_cost = tour, cost
+
+        # Polish the best greedy tour with 2-opt / Or-opt moves.
+        better_tour, better_cost = improve_tour(graph, best_tour, time_limit=2.0)
+        if better_cost < best_cost:
+            print("\n✅ Improved Tour (2-opt / Or-opt):")
+            print(f"   Path: {_path_text(better_tour)}")
+            print(f"   Total Cost: {better_cost}")
+
+        # On small maps, compare against the exact optimum.
+        if len(tour) - 1 <= HELD_KARP_MAX_CITIES:
+            stats = {}
+            _, optimal_cost = held_karp(graph, start_node, stats=stats)
+            print(f"\n📏 Optimal Cost (Held-Karp, {stats['nodes']} subproblems): {optimal_cost}")
+            print(f"   Greedy tour gap: {optimality_gap(cost, optimal_cost):.1%}")
+            print(f"   Improved tour gap: {optimality_gap(min(best_cost, better_cost), optimal_cost):.1%}")
     else:
         # Otherwise, inform the user that a tour could not be completed.
         print("\n❌ Could not find a complete tour.")
\ No newline at end of file